@@ -22,6 +22,7 @@ from app.models.user import *
 from app.models.task_model import *
 from app.models.blacklisted_model import *
 from app.database.base_class import Base
+from app.models.task_model import include_in_autogenerate
 target_metadata = Base.metadata
 
 
@@ -31,6 +32,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_in_autogenerate,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -40,7 +42,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_in_autogenerate)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,26 @@
+"""add task keyset pagination index
+
+Revision ID: 3c9d1f2a7b64
+Revises: a0e2359aeef2
+Create Date: 2026-10-17 10:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d1f2a7b64'
+down_revision: Union[str, None] = 'a0e2359aeef2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_task_user_id_created_at_id', 'task', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_user_id_created_at_id', table_name='task')
@@ -0,0 +1,62 @@
+"""add task full text search
+
+Revision ID: 4d6e8b2f1a97
+Revises: 9f3c5a1d7e28
+Create Date: 2026-10-17 16:04:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d6e8b2f1a97'
+down_revision: Union[str, None] = '9f3c5a1d7e28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE task_fts USING fts5(title, description, content='task', content_rowid='rowid')",
+    "CREATE TRIGGER task_fts_insert AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER task_fts_delete AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER task_fts_update AFTER UPDATE OF title, description ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO task_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    "INSERT INTO task_fts(task_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+        return
+
+    op.add_column('task', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_task_search_vector', 'task', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for trigger in ('task_fts_insert', 'task_fts_delete', 'task_fts_update'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS task_fts")
+        return
+
+    op.drop_index('ix_task_search_vector', table_name='task', postgresql_using='gin')
+    op.drop_column('task', 'search_vector')
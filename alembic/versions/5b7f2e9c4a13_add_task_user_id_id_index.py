@@ -0,0 +1,27 @@
+"""add task user_id id index
+
+Revision ID: 5b7f2e9c4a13
+Revises: 8e41b6c0d2f9
+Create Date: 2026-10-17 12:26:05.731482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7f2e9c4a13'
+down_revision: Union[str, None] = '8e41b6c0d2f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (user_id, created_at) lookups are served by the prefix of ix_task_user_id_created_at_id
+    op.create_index('ix_task_user_id_id', 'task', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_user_id_id', table_name='task')
@@ -0,0 +1,26 @@
+"""add task version
+
+Revision ID: 7a2d9e4c6b13
+Revises: e71b0c9d3a52
+Create Date: 2026-10-17 17:36:15.442890
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2d9e4c6b13'
+down_revision: Union[str, None] = 'e71b0c9d3a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('task', 'version')
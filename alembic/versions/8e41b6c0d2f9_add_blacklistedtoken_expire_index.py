@@ -0,0 +1,26 @@
+"""add blacklistedtoken expire index
+
+Revision ID: 8e41b6c0d2f9
+Revises: 3c9d1f2a7b64
+Create Date: 2026-10-17 11:03:17.554920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e41b6c0d2f9'
+down_revision: Union[str, None] = '3c9d1f2a7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_blacklistedtoken_expire'), 'blacklistedtoken', ['expire'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_blacklistedtoken_expire'), table_name='blacklistedtoken')
@@ -0,0 +1,26 @@
+"""add user tasks_version
+
+Revision ID: 9f3c5a1d7e28
+Revises: c2a84d7e1f05
+Create Date: 2026-10-17 15:21:09.624581
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f3c5a1d7e28'
+down_revision: Union[str, None] = 'c2a84d7e1f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('tasks_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'tasks_version')
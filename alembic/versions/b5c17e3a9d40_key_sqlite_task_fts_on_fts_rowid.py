@@ -0,0 +1,77 @@
+"""key sqlite task fts on fts_rowid
+
+Revision ID: b5c17e3a9d40
+Revises: 7a2d9e4c6b13
+Create Date: 2026-10-17 18:52:09.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c17e3a9d40'
+down_revision: Union[str, None] = '7a2d9e4c6b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FTS_TRIGGERS = ('task_fts_insert', 'task_fts_delete', 'task_fts_update')
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE task_fts USING fts5(title, description, content='task', content_rowid='fts_rowid')",
+    "CREATE TRIGGER task_fts_insert AFTER INSERT ON task BEGIN "
+    "UPDATE task SET fts_rowid = (SELECT coalesce(max(fts_rowid), 0) + 1 FROM task) WHERE rowid = new.rowid; "
+    "INSERT INTO task_fts(rowid, title, description) "
+    "SELECT fts_rowid, new.title, new.description FROM task WHERE rowid = new.rowid; END",
+    "CREATE TRIGGER task_fts_delete AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) VALUES ('delete', old.fts_rowid, old.title, old.description); END",
+    "CREATE TRIGGER task_fts_update AFTER UPDATE OF title, description ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) VALUES ('delete', old.fts_rowid, old.title, old.description); "
+    "INSERT INTO task_fts(rowid, title, description) VALUES (new.fts_rowid, new.title, new.description); END",
+    "INSERT INTO task_fts(task_fts) VALUES ('rebuild')",
+]
+
+PREVIOUS_SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE task_fts USING fts5(title, description, content='task', content_rowid='rowid')",
+    "CREATE TRIGGER task_fts_insert AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER task_fts_delete AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER task_fts_update AFTER UPDATE OF title, description ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO task_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    "INSERT INTO task_fts(task_fts) VALUES ('rebuild')",
+]
+
+
+def _drop_fts() -> None:
+    for trigger in FTS_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS task_fts")
+
+
+def upgrade() -> None:
+    # Postgres searches a generated column and is unaffected
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    _drop_fts()
+    op.add_column('task', sa.Column('fts_rowid', sa.Integer(), nullable=True))
+    op.execute("UPDATE task SET fts_rowid = rowid")
+    op.create_index('ix_task_fts_rowid', 'task', ['fts_rowid'], unique=True)
+    for statement in SQLITE_FTS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    _drop_fts()
+    op.drop_index('ix_task_fts_rowid', table_name='task')
+    op.drop_column('task', 'fts_rowid')
+    for statement in PREVIOUS_SQLITE_FTS:
+        op.execute(statement)
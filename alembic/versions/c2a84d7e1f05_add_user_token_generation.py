@@ -0,0 +1,26 @@
+"""add user token_generation
+
+Revision ID: c2a84d7e1f05
+Revises: 5b7f2e9c4a13
+Create Date: 2026-10-17 13:02:44.180316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a84d7e1f05'
+down_revision: Union[str, None] = '5b7f2e9c4a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('token_generation', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'token_generation')
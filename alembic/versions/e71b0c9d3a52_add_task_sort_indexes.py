@@ -0,0 +1,28 @@
+"""add task sort indexes
+
+Revision ID: e71b0c9d3a52
+Revises: 4d6e8b2f1a97
+Create Date: 2026-10-17 16:48:52.307715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e71b0c9d3a52'
+down_revision: Union[str, None] = '4d6e8b2f1a97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_task_user_id_updated_at_id', 'task', ['user_id', 'updated_at', 'id'], unique=False)
+    op.create_index('ix_task_user_id_title_id', 'task', ['user_id', 'title', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_user_id_title_id', table_name='task')
+    op.drop_index('ix_task_user_id_updated_at_id', table_name='task')
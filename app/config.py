@@ -1,3 +1,5 @@
+import os
+
 from pydantic import PostgresDsn
 from pydantic_settings import BaseSettings
 from decouple import config
@@ -5,8 +7,51 @@ from decouple import config
 
 class Settings(BaseSettings):
     pg_dsn: str = config('DATABASE_URL')
+    database_replica_urls: str = config('DATABASE_REPLICA_URLS', default='')
+    replica_routing: str = config('REPLICA_ROUTING', default='round_robin')
+    replica_sticky_seconds: float = config('REPLICA_STICKY_SECONDS', default=5, cast=float)
     secret_key_jwt: str = config('SECRET_KEY')
     algorithm: str = config('ALGORITHM')
+    jwt_kid: str = config('JWT_KID', default='default')
+    jwt_private_key_file: str = config('JWT_PRIVATE_KEY_FILE', default='')
+    jwt_previous_keys: str = config('JWT_PREVIOUS_KEYS', default='')
+
+    db_pool_size: int = config('DB_POOL_SIZE', default=5, cast=int)
+    db_max_overflow: int = config('DB_MAX_OVERFLOW', default=10, cast=int)
+    db_pool_timeout: float = config('DB_POOL_TIMEOUT', default=30, cast=float)
+    db_pool_recycle: int = config('DB_POOL_RECYCLE', default=-1, cast=int)
+    db_pool_pre_ping: bool = config('DB_POOL_PRE_PING', default=False, cast=bool)
+
+    tasks_bulk_max: int = config('TASKS_BULK_MAX', default=500, cast=int)
+
+    revocation_bloom_capacity: int = config('REVOCATION_BLOOM_CAPACITY', default=100_000, cast=int)
+    revocation_bloom_error_rate: float = config('REVOCATION_BLOOM_ERROR_RATE', default=0.01, cast=float)
+    revocation_negative_ttl_seconds: int = config('REVOCATION_NEGATIVE_TTL_SECONDS', default=30, cast=int)
+    revocation_negative_cache_size: int = config('REVOCATION_NEGATIVE_CACHE_SIZE', default=10_000, cast=int)
+    revocation_refresh_seconds: int = config('REVOCATION_REFRESH_SECONDS', default=60, cast=int)
+
+    principal_cache_size: int = config('PRINCIPAL_CACHE_SIZE', default=10_000, cast=int)
+    principal_cache_ttl_seconds: int = config('PRINCIPAL_CACHE_TTL_SECONDS', default=60, cast=int)
+
+    hash_executor: str = config('HASH_EXECUTOR', default='thread')
+    hash_workers: int = config('HASH_WORKERS', default=os.cpu_count() or 1, cast=int)
+    hash_max_concurrency: int = config('HASH_MAX_CONCURRENCY', default=os.cpu_count() or 1, cast=int)
+
+    blacklist_sweep_interval_seconds: int = config('BLACKLIST_SWEEP_INTERVAL_SECONDS', default=300, cast=int)
+    blacklist_sweep_batch_size: int = config('BLACKLIST_SWEEP_BATCH_SIZE', default=1000, cast=int)
+
+    login_throttle_enabled: bool = config('LOGIN_THROTTLE_ENABLED', default=True, cast=bool)
+    login_throttle_ip_burst: int = config('LOGIN_THROTTLE_IP_BURST', default=30, cast=int)
+    login_throttle_ip_per_minute: float = config('LOGIN_THROTTLE_IP_PER_MINUTE', default=30, cast=float)
+    login_throttle_account_burst: int = config('LOGIN_THROTTLE_ACCOUNT_BURST', default=10, cast=int)
+    login_throttle_account_per_minute: float = config('LOGIN_THROTTLE_ACCOUNT_PER_MINUTE', default=5, cast=float)
+    login_throttle_max_keys: int = config('LOGIN_THROTTLE_MAX_KEYS', default=100_000, cast=int)
+
+    db_warmup_connections: int = config('DB_WARMUP_CONNECTIONS', default=2, cast=int)
+    shutdown_drain_timeout_seconds: float = config('SHUTDOWN_DRAIN_TIMEOUT_SECONDS', default=30, cast=float)
+    shutdown_prestop_delay_seconds: float = config('SHUTDOWN_PRESTOP_DELAY_SECONDS', default=15, cast=float)
+
+    server_timing_sample_rate: float = config('SERVER_TIMING_SAMPLE_RATE', default=0.01, cast=float)
 
 
 settings = Settings()
@@ -11,10 +11,27 @@ class Base(AsyncAttrs, DeclarativeBase):
 
         try:
             db.add(self)
+            # generated columns come back through INSERT ... RETURNING (eager_defaults)
             await db.commit()
-            await db.refresh(self)
+            if db.sync_session.expire_on_commit:
+                await db.refresh(self)
             return self
         except SQLAlchemyError as ex:
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)) from ex
+
+    @classmethod
+    async def save_many(cls, db: AsyncSession, instances: list):
+
+        try:
+            db.add_all(instances)
+            await db.commit()
+            if db.sync_session.expire_on_commit:
+                for instance in instances:
+                    await db.refresh(instance)
+            return instances
+        except SQLAlchemyError as ex:
+            await db.rollback()
             raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)) from ex
 
     @classmethod
@@ -1,10 +1,28 @@
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from app.config import settings
+from app.database.pool import InstrumentedQueuePool
 
-engine = create_async_engine(str(settings.pg_dsn))
 
-async_session_maker = async_sessionmaker(bind=engine, class_=AsyncSession)
+def engine_options(dsn: str) -> dict:
+    # SQLite picks its own pool (static for :memory:) and rejects queue sizing
+    if make_url(dsn).get_backend_name() == "sqlite":
+        return {}
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+engine = create_async_engine(str(settings.pg_dsn), **engine_options(str(settings.pg_dsn)))
+
+async_session_maker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 
 async def get_db():
@@ -13,7 +31,3 @@ async def get_db():
             yield session
         finally:
             await session.close()    
-
-
-
-
@@ -0,0 +1,56 @@
+import bisect
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class CheckoutWaitHistogram:
+    def __init__(self, buckets: tuple = CHECKOUT_WAIT_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{bound}" for bound in self.buckets] + ["le_inf"]
+        return {"buckets": dict(zip(labels, self.counts)), "count": self.count, "sum_ms": round(self.sum_ms, 3)}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = CheckoutWaitHistogram()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.checkout_wait.observe((time.perf_counter() - start) * 1000)
+
+
+def pool_stats(pool: Pool) -> dict:
+    stats = {"pool": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow_in_use=max(pool.overflow(), 0),
+        )
+
+    if isinstance(pool, InstrumentedQueuePool):
+        stats["checkout_wait_ms"] = pool.checkout_wait.snapshot()
+
+    return stats
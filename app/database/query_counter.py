@@ -0,0 +1,61 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """Statements executed and seconds spent in the database within one tracked scope.
+
+    Scopes nest: a statement counts towards the innermost scope and every
+    scope enclosing it, so a test can wrap a request that tracks itself.
+    """
+
+    __slots__ = ("count", "duration", "statements", "parent")
+
+    def __init__(self, parent: "QueryStats | None" = None, record_statements: bool = False):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: list[str] | None = [] if record_statements else None
+        self.parent = parent
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    stats = QueryStats(parent=_current.get(), record_statements=record_statements)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    """Stats of the innermost tracked scope, e.g. the running request's."""
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    duration = time.perf_counter() - conn.info["query_start"].pop()
+    while stats is not None:
+        stats.count += 1
+        stats.duration += duration
+        if stats.statements is not None:
+            stats.statements.append(statement)
+        stats = stats.parent
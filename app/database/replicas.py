@@ -0,0 +1,111 @@
+import itertools
+import time
+from collections import OrderedDict
+
+from fastapi import Depends, Request
+from jose import jwt, JWTError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.config import settings
+from app.database.connections import engine_options, get_db
+
+
+class ReplicaRouter:
+    """Chooses a read replica for read-only requests.
+
+    Replicas are taken round-robin, or by fewest checked-out connections with
+    the ``least_load`` strategy. A subject that wrote within the last
+    ``sticky_seconds`` reads from the primary so it never misses its own
+    writes while replicas catch up. Writes are remembered per process, so
+    with several workers read-your-writes only holds for requests that land
+    on the worker which handled the write.
+    """
+
+    def __init__(self, session_makers: list[async_sessionmaker], sticky_seconds: float,
+                 strategy: str = "round_robin", max_sticky: int = 100_000):
+        if strategy not in ("round_robin", "least_load"):
+            raise ValueError(f"Unknown replica routing strategy {strategy!r}")
+        self.session_makers = session_makers
+        self.sticky_seconds = sticky_seconds
+        self.strategy = strategy
+        self.max_sticky = max_sticky
+        self.reset()
+
+    def reset(self) -> None:
+        self._sticky: OrderedDict[str, float] = OrderedDict()
+        self._round_robin = itertools.cycle(range(len(self.session_makers)))
+        self.stats = {"replica_reads": [0] * len(self.session_makers), "primary_reads": 0, "sticky_reads": 0}
+
+    def mark_write(self, subject: str) -> None:
+        if not self.session_makers:
+            return
+        self._sticky[subject] = time.monotonic() + self.sticky_seconds
+        self._sticky.move_to_end(subject)
+        while len(self._sticky) > self.max_sticky:
+            self._sticky.popitem(last=False)
+
+    def is_sticky(self, subject: str | None) -> bool:
+        if subject is None:
+            return False
+        deadline = self._sticky.get(subject)
+        if deadline is None:
+            return False
+        if deadline <= time.monotonic():
+            del self._sticky[subject]
+            return False
+        return True
+
+    def pick(self, subject: str | None) -> async_sessionmaker | None:
+        """Session factory of the replica to read from, or ``None`` to stay on the primary."""
+        if not self.session_makers:
+            self.stats["primary_reads"] += 1
+            return None
+        if self.is_sticky(subject):
+            self.stats["sticky_reads"] += 1
+            return None
+        index = self._least_loaded() if self.strategy == "least_load" else next(self._round_robin)
+        self.stats["replica_reads"][index] += 1
+        return self.session_makers[index]
+
+    def _least_loaded(self) -> int:
+        def checked_out(index: int) -> int:
+            pool = self.session_makers[index].kw["bind"].pool
+            return pool.checkedout() if hasattr(pool, "checkedout") else 0
+        return min(range(len(self.session_makers)), key=checked_out)
+
+
+def replica_urls(value: str) -> list[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+replica_engines = [create_async_engine(url, **engine_options(url)) for url in replica_urls(settings.database_replica_urls)]
+
+replica_router = ReplicaRouter(
+    session_makers=[async_sessionmaker(bind=replica, class_=AsyncSession, expire_on_commit=False) for replica in replica_engines],
+    sticky_seconds=settings.replica_sticky_seconds,
+    strategy=settings.replica_routing,
+)
+
+
+def request_subject(request: Request) -> str | None:
+    # only used to pick a database, so the signature is checked later by get_current_user
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)):
+    """Session for read-only work: a replica when one is configured, else the request's primary session."""
+    session_maker = replica_router.pick(request_subject(request) if replica_router.session_makers else None)
+    if session_maker is None:
+        yield db
+        return
+    async with session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
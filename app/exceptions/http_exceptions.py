@@ -41,4 +41,21 @@ class ForbiddenException(HTTPException):
         super().__init__(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=detail if detail else "Forbidden",
-        )
\ No newline at end of file
+        )
+
+
+class PreconditionFailedException(HTTPException):
+    def __init__(self, detail: Any = None) -> None:
+        super().__init__(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=detail if detail else "Precondition failed",
+        )
+
+
+class TooManyRequestsException(HTTPException):
+    def __init__(self, retry_after: int, detail: Any = None) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail if detail else "Too many requests",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -1,15 +1,67 @@
+import asyncio
 import logging
 import sys
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
-from app.routes import auth, task
+from fastapi.responses import ORJSONResponse
 
+from app.routes import auth, task, stats
+from app.middleware.timing import ServerTimingMiddleware
+from app.middleware.query_count import QueryCountMiddleware
+from app.database.connections import async_session_maker, engine
+from app.database.replicas import replica_engines
+from app.middleware.drain import DrainMiddleware, drain_on_signal, in_flight
+from app.services.revocation import revocation_cache
+from app.services.hash import hash_executor
+from app.services.blacklist_sweeper import run_blacklist_sweeper
+from app.services.warmup import warm_up
+from app.config import settings
 
-app = FastAPI()
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        async with async_session_maker() as db:
+            await revocation_cache.rebuild(db=db)
+    except Exception as ex:
+        # the cache loads itself on the first authenticated request instead
+        logger.warning(f"Could not preload revoked tokens: {ex}")
+
+    await warm_up(engines=[engine, *replica_engines], connections=settings.db_warmup_connections)
+
+    sweeper = asyncio.create_task(run_blacklist_sweeper(
+        interval=settings.blacklist_sweep_interval_seconds,
+        batch_size=settings.blacklist_sweep_batch_size,
+    ))
+
+    restore_signal = drain_on_signal(in_flight, timeout=settings.shutdown_drain_timeout_seconds,
+                                     prestop_delay=settings.shutdown_prestop_delay_seconds)
+
+    yield
+
+    restore_signal()
+    sweeper.cancel()
+    with suppress(asyncio.CancelledError, Exception):
+        await sweeper
+    hash_executor.shutdown()
+    for db_engine in [engine, *replica_engines]:
+        await db_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+app.add_middleware(ServerTimingMiddleware, sample_rate=settings.server_timing_sample_rate)
+app.add_middleware(QueryCountMiddleware)
+# added last so it is outermost and counts a request for its whole lifetime
+app.add_middleware(DrainMiddleware)
 
 app.include_router(auth.router)
 app.include_router(task.router)
+app.include_router(stats.router)
 
 
 @app.get('/')
@@ -17,7 +69,7 @@ def get_hello():
     return {"message": 'Hello world'}
 
 
-
-
-
-
+@app.get('/ready')
+def get_ready():
+    # DrainMiddleware answers 503 here once shutdown has begun, taking the worker out of rotation
+    return {"status": "ready"}
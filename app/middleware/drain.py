@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import signal
+import threading
+from typing import Callable
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+logger = logging.getLogger(__name__)
+
+
+class InFlightRequests:
+    """Counts HTTP requests being handled so shutdown can wait for them."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.draining = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def started(self) -> None:
+        self.count += 1
+        self._idle.clear()
+
+    def finished(self) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> bool:
+        """Refuse new requests and wait up to ``timeout`` seconds for running ones; True if all finished."""
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+in_flight = InFlightRequests()
+
+
+class DrainMiddleware:
+    """Tracks in-flight requests and fails the readiness probe once shutdown has started draining.
+
+    Other requests are still served while draining, since the load balancer
+    keeps routing until it has seen the probe fail; their responses carry
+    ``Connection: close`` so keep-alive clients reconnect elsewhere.
+    """
+
+    def __init__(self, app: ASGIApp, tracker: InFlightRequests = in_flight, readiness_path: str = "/ready"):
+        self.app = app
+        self.tracker = tracker
+        self.readiness_path = readiness_path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.tracker.draining and scope["path"] == self.readiness_path:
+            await send({"type": "http.response.start", "status": 503,
+                        "headers": [(b"connection", b"close"), (b"retry-after", b"1")]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_closing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.tracker.draining:
+                MutableHeaders(scope=message)["Connection"] = "close"
+            await send(message)
+
+        self.tracker.started()
+        try:
+            await self.app(scope, receive, send_closing)
+        finally:
+            self.tracker.finished()
+
+
+def drain_on_signal(tracker: InFlightRequests, timeout: float, prestop_delay: float = 0.0,
+                    sig: int = signal.SIGTERM) -> Callable[[], None]:
+    """Start draining when ``sig`` arrives and pass the signal on to the server afterwards.
+
+    The readiness probe fails at once, requests keep being served for
+    ``prestop_delay`` seconds while the load balancer notices, and then up to
+    ``timeout`` seconds are spent waiting for running requests. uvicorn stops
+    accepting connections and waits for them before it runs the lifespan
+    shutdown, so all of this has to happen in the signal handler, ahead of
+    the server's own. A second signal is passed on at once. Returns a
+    function restoring the previous handler.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        # handlers can only be installed from the main thread
+        return lambda: None
+
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(sig)
+    drains: set[asyncio.Task] = set()
+    passed_on = False
+
+    def pass_on(frame) -> None:
+        nonlocal passed_on
+        if passed_on:
+            return
+        passed_on = True
+        if callable(previous):
+            previous(sig, frame)
+        else:
+            signal.signal(sig, previous)
+            signal.raise_signal(sig)
+
+    async def drain_then_pass_on(frame) -> None:
+        await asyncio.sleep(prestop_delay)
+        if not await tracker.drain(timeout=timeout):
+            logger.warning(f"{tracker.count} request(s) still running after {timeout}s of draining")
+        pass_on(frame)
+
+    def handle(signum, frame) -> None:
+        if tracker.draining:
+            pass_on(frame)
+            return
+        tracker.draining = True
+        logger.info(f"Failing readiness for {prestop_delay}s, then draining for up to {timeout}s before shutting down")
+
+        def start() -> None:
+            drain = loop.create_task(drain_then_pass_on(frame))
+            drains.add(drain)
+            drain.add_done_callback(drains.discard)
+
+        loop.call_soon_threadsafe(start)
+
+    signal.signal(sig, handle)
+
+    def restore() -> None:
+        if signal.getsignal(sig) is handle:
+            signal.signal(sig, previous)
+
+    return restore
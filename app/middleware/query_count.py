@@ -0,0 +1,31 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database.query_counter import track_queries
+
+
+class QueryCountMiddleware:
+    """Reports how many SQL statements a request ran and how long they took.
+
+    Counts go into ``X-DB-Queries`` / ``X-DB-Time-Ms`` response headers. Sampled
+    requests also get them in ServerTimingMiddleware's log line, which includes
+    statements issued after the response starts, e.g. by a streaming body.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_counts(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-DB-Queries", str(stats.count))
+                    headers.append("X-DB-Time-Ms", f"{stats.duration * 1000:.2f}")
+                await send(message)
+
+            await self.app(scope, receive, send_with_counts)
@@ -0,0 +1,89 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database.query_counter import current_query_stats
+
+
+logger = logging.getLogger(__name__)
+
+_phases: ContextVar[dict[str, float] | None] = ContextVar("request_phases", default=None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to the current request's ``name`` phase.
+
+    Does nothing outside a sampled request, so it is safe to leave on hot paths.
+    """
+    phases = _phases.get()
+    if phases is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def server_timing(phases: dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={duration:.2f}" for name, duration in phases.items())
+
+
+class ServerTimingMiddleware:
+    """Times request phases for a sample of requests.
+
+    Sampled responses get a ``Server-Timing`` header and one JSON log line with
+    the phase durations in milliseconds, plus the request's SQL statement
+    count and time when queries are tracked. Unsampled requests skip all of it.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._sampled():
+            await self.app(scope, receive, send)
+            return
+
+        phases: dict[str, float] = {}
+        token = _phases.set(phases)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                phases["total"] = (time.perf_counter() - start) * 1000
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(phases))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _phases.reset(token)
+            record = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "phases_ms": {name: round(duration, 3) for name, duration in phases.items()},
+            }
+            # QueryCountMiddleware tracks the request's statements; they share this line instead of logging their own
+            queries = current_query_stats()
+            if queries is not None:
+                record["db_queries"] = queries.count
+                record["db_ms"] = round(queries.duration * 1000, 3)
+            logger.info(orjson.dumps(record).decode())
+
+    def _sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
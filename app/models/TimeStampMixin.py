@@ -1,11 +1,19 @@
 from datetime import date
 
 from sqlalchemy import DateTime, func
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import Mapped, mapped_column
 
+# SQLite's CURRENT_TIMESTAMP has no fractional part; bind parameters must be
+# rendered the same way or range comparisons on these columns go wrong.
+TimeStamp = DateTime().with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite")
+
 
 class TimeStampMixin:
+    # fetch the SQL-side timestamps in the INSERT/UPDATE itself instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     created_at: Mapped[date] = mapped_column(
-        'created_at', DateTime, default=func.now(), nullable=True)
+        'created_at', TimeStamp, default=func.now(), nullable=True)
     updated_at: Mapped[date] = mapped_column(
-        'updated_at', DateTime, default=func.now(), onupdate=func.now(), nullable=True)
+        'updated_at', TimeStamp, default=func.now(), onupdate=func.now(), nullable=True)
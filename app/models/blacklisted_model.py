@@ -10,5 +10,5 @@ class BlacklistedToken(TimeStampMixin, Base):
     __tablename__ = "blacklistedtoken"
 
     id: Mapped[str] = mapped_column(String(255), primary_key=True, index=True)
-    expire: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    expire: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
 
@@ -1,7 +1,8 @@
+import re
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Text, ForeignKey, select
+from sqlalchemy import DDL, Text, ForeignKey, Index, and_, event, func, lambda_stmt, literal_column, or_, select, table, column
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.base_class import Base
@@ -10,14 +11,23 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
     from .user import User
+    from app.schemas.tasks_schema import TaskListSpec
 
 
 class Task(TimeStampMixin, Base):
     __tablename__ = "task"
+    __table_args__ = (
+        Index("ix_task_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_task_user_id_id", "user_id", "id"),
+        Index("ix_task_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        Index("ix_task_user_id_title_id", "user_id", "title", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, index=True, default=uuid.uuid4)
     title: Mapped[str]
     description: Mapped[str] = mapped_column(Text)
+    # bumped by every write; compared in the UPDATE's WHERE clause for If-Match
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"))
     user: Mapped["User"] = relationship(back_populates="tasks")
 
@@ -27,4 +37,115 @@ class Task(TimeStampMixin, Base):
         result = await db.execute(query)
         return result.scalars().all()
 
+    @classmethod
+    async def get_version(cls, db: AsyncSession, user: "User", task_id: uuid.UUID) -> int | None:
+        query = select(cls.version).where(cls.id == task_id, cls.user_id == user.id)
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def search_by_user(cls, db: AsyncSession, user: "User", terms: list[str], limit: int, offset: int = 0):
+        """Tasks of ``user`` containing every term, best match first, as (task, rank) rows.
+
+        Postgres matches against the generated ``search_vector`` column, SQLite
+        against the ``task_fts`` FTS5 table; in both a higher rank is better.
+        """
+        if db.get_bind().dialect.name == "sqlite":
+            match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+            rank = (-func.bm25(literal_column("task_fts"), 2.0, 1.0)).label("rank")
+            query = (select(cls, rank)
+                     .join(task_fts, task_fts.c.rowid == literal_column("task.fts_rowid"))
+                     .where(literal_column("task_fts").op("MATCH")(match)))
+        else:
+            search_vector = literal_column("task.search_vector")
+            tsquery = func.plainto_tsquery("english", " ".join(terms))
+            rank = func.ts_rank(search_vector, tsquery).label("rank")
+            query = select(cls, rank).where(search_vector.op("@@")(tsquery))
+        query = query.where(cls.user_id == user.id).order_by(rank.desc(), cls.id).limit(limit).offset(offset)
+        result = await db.execute(query)
+        return result.all()
+
+    @classmethod
+    async def find_page_by_user(cls, db: AsyncSession, user: "User", limit: int, after: tuple | None = None,
+                                spec: "TaskListSpec | None" = None):
+        """Keyset page of ``user``'s tasks ordered by (spec.sort, id), starting after the ``after`` key.
+
+        Built as a lambda statement: each combination of filters is compiled
+        once and later calls only bind new values.
+        """
+        user_id = user.id
+        query = lambda_stmt(lambda: select(cls).where(cls.user_id == user_id))
+
+        if spec is not None:
+            if spec.created_after is not None:
+                created_after = spec.created_after
+                query += lambda q: q.where(cls.created_at >= created_after)
+            if spec.created_before is not None:
+                created_before = spec.created_before
+                query += lambda q: q.where(cls.created_at < created_before)
+            if spec.updated_after is not None:
+                updated_after = spec.updated_after
+                query += lambda q: q.where(cls.updated_at >= updated_after)
+            if spec.updated_before is not None:
+                updated_before = spec.updated_before
+                query += lambda q: q.where(cls.updated_at < updated_before)
+            if spec.title_prefix is not None:
+                # LIKE alone: a >=/< range would assume a byte-order collation, which Postgres' default is not
+                pattern = re.sub(r"([/%_])", r"/\1", spec.title_prefix) + "%"
+                query += lambda q: q.where(cls.title.like(pattern, escape="/"))
+
+        # keyset condition spelled out per column so each value binds with its column's type;
+        # the redundant range on the sort column is what the index seeks on
+        sort_column = getattr(cls, spec.sort if spec is not None else "created_at")
+        if spec is not None and spec.order == "desc":
+            if after is not None:
+                after_value, after_id = after
+                query += lambda q: q.where(sort_column <= after_value, or_(
+                    sort_column < after_value, and_(sort_column == after_value, cls.id < after_id)))
+            query += lambda q: q.order_by(sort_column.desc(), cls.id.desc()).limit(limit)
+        else:
+            if after is not None:
+                after_value, after_id = after
+                query += lambda q: q.where(sort_column >= after_value, or_(
+                    sort_column > after_value, and_(sort_column == after_value, cls.id > after_id)))
+            query += lambda q: q.order_by(sort_column, cls.id).limit(limit)
+
+        result = await db.execute(query)
+        return result.scalars().all()
+
+
+# SQLite full-text index, kept in sync by triggers. Postgres gets a generated
+# tsvector column with a GIN index from the migration instead.
+task_fts = table("task_fts", column("rowid"))
+
+# The FTS rows are keyed on fts_rowid, an integer the insert trigger hands out,
+# because VACUUM may renumber the implicit rowid of a table with a UUID key.
+_SQLITE_FTS_DDL = [
+    "ALTER TABLE task ADD COLUMN fts_rowid INTEGER",
+    "CREATE UNIQUE INDEX ix_task_fts_rowid ON task (fts_rowid)",
+    "CREATE VIRTUAL TABLE task_fts USING fts5(title, description, content='task', content_rowid='fts_rowid')",
+    "CREATE TRIGGER task_fts_insert AFTER INSERT ON task BEGIN "
+    "UPDATE task SET fts_rowid = (SELECT coalesce(max(fts_rowid), 0) + 1 FROM task) WHERE rowid = new.rowid; "
+    "INSERT INTO task_fts(rowid, title, description) "
+    "SELECT fts_rowid, new.title, new.description FROM task WHERE rowid = new.rowid; END",
+    "CREATE TRIGGER task_fts_delete AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) VALUES ('delete', old.fts_rowid, old.title, old.description); END",
+    "CREATE TRIGGER task_fts_update AFTER UPDATE OF title, description ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) VALUES ('delete', old.fts_rowid, old.title, old.description); "
+    "INSERT INTO task_fts(rowid, title, description) VALUES (new.fts_rowid, new.title, new.description); END",
+]
+
+for _statement in _SQLITE_FTS_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Task.__table__, "before_drop", DDL("DROP TABLE IF EXISTS task_fts").execute_if(dialect="sqlite"))
+
+
+# Search objects the migrations create per dialect instead of the mapping
+UNMAPPED_SEARCH_OBJECTS = {"search_vector", "ix_task_search_vector", "fts_rowid", "ix_task_fts_rowid"}
+
 
+def include_in_autogenerate(object, name, type_, reflected, compare_to) -> bool:
+    """Alembic ``include_object`` hook that keeps autogenerate from dropping the search objects."""
+    if reflected and compare_to is None:
+        return not (name in UNMAPPED_SEARCH_OBJECTS or (type_ == "table" and name.startswith("task_fts")))
+    return True
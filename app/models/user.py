@@ -3,7 +3,7 @@ from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, select, ForeignKey, Text, DateTime, func
+from sqlalchemy import String, Integer, select, or_, ForeignKey, Text, DateTime, func
 
 from typing import TYPE_CHECKING
 
@@ -18,7 +18,7 @@ if TYPE_CHECKING:
 class User(TimeStampMixin, Base):
     __tablename__ = "user"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, index=True, default=uuid.uuid4())
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, index=True, default=uuid.uuid4)
     username: Mapped[str] = mapped_column(index=True, unique=True)
     email: Mapped[str] = mapped_column(index=True, unique=True)
     first_name: Mapped[str] = mapped_column(String(30))
@@ -27,6 +27,8 @@ class User(TimeStampMixin, Base):
     password: Mapped[str] = mapped_column(String(255), nullable=False)
     refresh_token: Mapped[str] = mapped_column(String(255), nullable=True)
     is_active: Mapped[bool] = mapped_column(default=False)
+    token_generation: Mapped[int] = mapped_column(default=0, server_default="0")
+    tasks_version: Mapped[int] = mapped_column(default=0, server_default="0")
     tasks: Mapped[list["Task"]] = relationship(back_populates="user")
 
     @classmethod
@@ -41,6 +43,19 @@ class User(TimeStampMixin, Base):
         result = await db.execute(query)
         return result.scalars().first()
 
+    @classmethod
+    async def get_tasks_version(cls, db: AsyncSession, user_id: uuid.UUID) -> int | None:
+        query = select(cls.tasks_version).where(cls.id == user_id)
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def find_taken_identifiers(cls, db: AsyncSession, email: str, username: str) -> tuple[bool, bool]:
+        """Whether ``email`` and ``username`` are already registered, in one round trip."""
+        query = select(cls.email, cls.username).where(or_(cls.email == email, cls.username == username)).limit(2)
+        rows = (await db.execute(query)).all()
+        return any(row.email == email for row in rows), any(row.username == username for row in rows)
+
 
 
 
@@ -1,14 +1,36 @@
-from sqlalchemy import select, update, insert, delete
+from sqlalchemy import case, select, update, insert, delete
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import selectinload
 from sqlalchemy.sql import and_
 
 
-from app.schemas.tasks_schema import TaskCreate, TaskUpdate
+from app.schemas.tasks_schema import TaskCreate, TaskUpdate, TaskListSpec, TaskBatchUpdateItem
+from app.exceptions.http_exceptions import BadRequestException, PreconditionFailedException
+from fastapi import HTTPException, status
 
 from app.models.user import User
 from app.models.task_model import Task
+from app.database.replicas import replica_router
+import base64
+import re
 import uuid
+from datetime import datetime
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+SEARCH_MAX_OFFSET = 10_000
+SEARCH_MAX_TERMS = 16
+
+
+
+def _bump_tasks_version(user: User):
+    # part of every task write's transaction; the ETags of task reads are derived from it.
+    # updated_at is set to itself so the column's onupdate does not count this as a change to the user
+    return (update(User).where(User.id == user.id)
+            .values(tasks_version=User.tasks_version + 1, updated_at=User.updated_at))
 
 
 
@@ -17,13 +39,37 @@ async def create_new_task(user: User, body: TaskCreate, db: AsyncSession):
     #smtm = insert(Task).values(**body.model_dump(exclude={"user_id"}), user_id=user.id).returning(Task)
     
     task = Task(**body.model_dump(exclude={"user_id"}), user_id=user.id)
+
+    await db.execute(_bump_tasks_version(user))
     
     newTask = await task.save(db=db)
+    replica_router.mark_write(user.email)
 
     return newTask
 
 
 
+async def create_new_tasks(user: User, bodies: list[TaskCreate], db: AsyncSession):
+
+    # executemany with RETURNING is sent as multi-row INSERT ... VALUES (...), (...) RETURNING
+    # the response pairs rows with the request bodies, so RETURNING must keep their order
+    smtm = insert(Task).returning(Task.id, Task.title, Task.description, Task.user_id, Task.created_at, Task.updated_at,
+                                  sort_by_parameter_order=True)
+
+    try:
+        result = await db.execute(smtm, [{**body.model_dump(), "user_id": user.id} for body in bodies])
+        new_tasks = result.all()
+        await db.execute(_bump_tasks_version(user))
+        await db.commit()
+        replica_router.mark_write(user.email)
+    except SQLAlchemyError as ex:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)) from ex
+
+    return new_tasks
+
+
+
 async def get_tasks(user: User, db: AsyncSession):
     
     tasks = await Task.find_by_user(db=db, user=user)
@@ -32,6 +78,57 @@ async def get_tasks(user: User, db: AsyncSession):
 
 
 
+def encode_cursor(task: Task, sort: str = "created_at") -> str:
+    value = getattr(task, sort)
+    raw = f"{sort}|{value if sort == 'title' else value.isoformat()}|{task.id.hex}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+
+def decode_cursor(cursor: str, sort: str = "created_at") -> tuple[datetime | str, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        cursor_sort, rest = raw.split("|", 1)
+        value, task_id = rest.rsplit("|", 1)
+        if cursor_sort != sort:
+            raise ValueError(f"cursor was issued for sort {cursor_sort}")
+        return (value if sort == "title" else datetime.fromisoformat(value)), uuid.UUID(hex=task_id)
+    except ValueError:
+        raise BadRequestException(detail="Invalid cursor")
+
+
+
+async def search_tasks(user: User, db: AsyncSession, query: str, limit: int = DEFAULT_PAGE_SIZE, offset: int = 0):
+
+    # only words reach the index, so search syntax in user input can't produce query errors
+    terms = re.findall(r"\w+", query.lower())[:SEARCH_MAX_TERMS]
+    if not terms:
+        raise BadRequestException(detail="Search query must contain at least one word")
+
+    rows = await Task.search_by_user(db=db, user=user, terms=terms, limit=limit + 1, offset=offset)
+
+    next_offset = offset + limit if len(rows) > limit else None
+
+    return rows[:limit], next_offset
+
+
+
+async def get_tasks_page(user: User, db: AsyncSession, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE,
+                         spec: TaskListSpec | None = None):
+
+    spec = spec or TaskListSpec()
+
+    after = decode_cursor(cursor, sort=spec.sort) if cursor else None
+
+    # one extra row tells us whether another page exists without a COUNT
+    tasks = await Task.find_page_by_user(db=db, user=user, limit=limit + 1, after=after, spec=spec)
+
+    next_cursor = encode_cursor(tasks[limit - 1], sort=spec.sort) if len(tasks) > limit else None
+
+    return tasks[:limit], next_cursor
+
+
+
 async def get_task_by_id(user: User, task_id: uuid.UUID, db: AsyncSession):
 
     #query = select(Task).options(selectinload(Task.user)).where(Task.id == task_id).where(Task.user_id == user.id)
@@ -58,15 +155,49 @@ async def get_all_tasks_and_their_user(db: AsyncSession):
 
 
 
-async def update_task(user: User, body: TaskUpdate, task_id: uuid.UUID, db: AsyncSession):
+async def stream_all_tasks_and_their_user(db: AsyncSession, batch_size: int = EXPORT_BATCH_SIZE):
+
+    # plain column rows through a server-side cursor: no identity map, at most one batch in memory
+    query = (
+        select(Task.id, Task.title, Task.description, Task.user_id, Task.created_at, Task.updated_at, User.email)
+        .join(Task.user)
+        .execution_options(yield_per=batch_size)
+    )
+
+    result = await db.stream(query)
+
+    async for rows in result.mappings().partitions():
+        yield rows
+
+
+
+async def update_task(user: User, body: TaskUpdate, task_id: uuid.UUID, db: AsyncSession, expected_version: int | None = None):
+
+    # only the fields the client sent; the version check rides in the same statement instead of a row lock
+    values = body.model_dump(exclude_unset=True, exclude_none=True)
+    if not values:
+        raise BadRequestException(detail="Nothing to update")
+
+    conditions = [Task.id == task_id, Task.user_id == user.id]
+    if expected_version is not None:
+        conditions.append(Task.version == expected_version)
 
-    updated_task = update(Task).where(and_(Task.id == task_id, Task.user_id == user.id)).values(title=body.title, description=body.description).returning(Task)
+    updated_task = update(Task).where(and_(*conditions)).values(**values, version=Task.version + 1).returning(Task)
 
     result = await db.execute(updated_task)
         
     updated_tAsk = result.fetchone() 
 
+    if updated_tAsk is None:
+        # nothing was written; the lookup only runs on a miss, to tell a stale version from a missing task
+        if expected_version is not None and await Task.get_version(db=db, user=user, task_id=task_id) is not None:
+            raise PreconditionFailedException(detail="Task was modified by another request")
+        return None
+
+    await db.execute(_bump_tasks_version(user))
+
     await db.commit()
+    replica_router.mark_write(user.email)
 
 
     #if res:
@@ -77,6 +208,10 @@ async def update_task(user: User, body: TaskUpdate, task_id: uuid.UUID, db: Asyn
 
 
 async def update_task_orm_mode(user: User, body: TaskUpdate, task_id: uuid.UUID, db: AsyncSession):
+
+    values = body.model_dump(exclude_unset=True, exclude_none=True)
+    if not values:
+        raise BadRequestException(detail="Nothing to update")
     
     get_updated_task = select(Task).filter_by(id=task_id, user_id=user.id)
 
@@ -86,11 +221,15 @@ async def update_task_orm_mode(user: User, body: TaskUpdate, task_id: uuid.UUID,
 
     if updated_task:
 
-        updated_task.title = body.title
+        for field, value in values.items():
+            setattr(updated_task, field, value)
+
+        updated_task.version = Task.version + 1
 
-        updated_task.description = body.description
+        await db.execute(_bump_tasks_version(user))
 
         await db.commit()
+        replica_router.mark_write(user.email)
 
         await db.refresh(updated_task)
 
@@ -100,16 +239,63 @@ async def update_task_orm_mode(user: User, body: TaskUpdate, task_id: uuid.UUID,
 
 async def delete_task(user: User, task_id: uuid.UUID, db: AsyncSession):
 
-    await db.execute(delete(Task).where(and_(Task.id == task_id, Task.user_id == user.id)))
+    result = await db.execute(delete(Task).where(and_(Task.id == task_id, Task.user_id == user.id)))
+
+    if result.rowcount:
+        await db.execute(_bump_tasks_version(user))
 
     await db.commit()
+    replica_router.mark_write(user.email)
 
 
 
+async def update_tasks(user: User, patches: list[TaskBatchUpdateItem], db: AsyncSession):
 
+    # one UPDATE ... SET col = CASE id WHEN ... END ... RETURNING: executemany can't return rows,
+    # and fields a patch leaves out fall through to ELSE and keep their value
+    # like a single PATCH, every item must change something; an empty one would still bump its version
+    empty = [patch.id for patch in patches if patch.title is None and patch.description is None]
+    if empty:
+        raise BadRequestException(detail=f"Nothing to update for tasks {', '.join(str(task_id) for task_id in empty)}")
 
+    values = {}
+    for field in ("title", "description"):
+        changes = {patch.id: getattr(patch, field) for patch in patches if getattr(patch, field) is not None}
+        if changes:
+            values[field] = case(changes, value=Task.id, else_=getattr(Task, field))
 
+    smtm = (update(Task)
+            .where(and_(Task.user_id == user.id, Task.id.in_([patch.id for patch in patches])))
+            .values(**values, version=Task.version + 1)
+            .returning(Task.id, Task.title, Task.description, Task.user_id, Task.created_at, Task.updated_at))
 
+    try:
+        updated_tasks = (await db.execute(smtm)).all()
+        if updated_tasks:
+            await db.execute(_bump_tasks_version(user))
+        await db.commit()
+    except SQLAlchemyError as ex:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)) from ex
+    replica_router.mark_write(user.email)
 
+    return updated_tasks
+
+
+
+async def delete_tasks(user: User, task_ids: list[uuid.UUID], db: AsyncSession) -> list[uuid.UUID]:
+
+    smtm = delete(Task).where(and_(Task.user_id == user.id, Task.id.in_(task_ids))).returning(Task.id)
+
+    try:
+        deleted_ids = (await db.execute(smtm)).scalars().all()
+        if deleted_ids:
+            await db.execute(_bump_tasks_version(user))
+        await db.commit()
+    except SQLAlchemyError as ex:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)) from ex
+    replica_router.mark_write(user.email)
+
+    return deleted_ids
 
-    
@@ -1,36 +1,73 @@
 from fastapi import Depends, HTTPException, status, Response
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.connections import get_db
 from app.schemas.user_schema import UserCreate, UserResponse, UserBase
 from app.schemas.token_schema import TokenPair
 from app.models.user import User
-from app.services.hash import get_password_hash
+from app.database.replicas import replica_router
+from app.services.hash import get_password_hash_async
 from app.services.auth import authenticate, create_token_pair, add_refresh_token_cookie
 from app.exceptions.http_exceptions import BadRequestException
+import re
 
 
 
 
 
+def _email_taken() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User with this email is already exist")
+
+
+def _username_taken(username: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"username {username} is already exist. Choose another username")
+
+
+# SQLite names only the column; its unique index is ix_user_<column> like on Postgres
+SQLITE_UNIQUE_VIOLATION = re.compile(r"UNIQUE constraint failed: user\.(\w+)$")
+
+
+def violated_constraint(ex: IntegrityError) -> str | None:
+    """Name of the unique index an INSERT into ``user`` violated, or None if it cannot be told."""
+    # asyncpg's error, which SQLAlchemy's adapted exception is raised from, carries the name
+    name = getattr(ex.orig.__cause__, "constraint_name", None)
+    if name is not None:
+        return name
+    match = SQLITE_UNIQUE_VIOLATION.match(str(ex.orig))
+    return f"ix_user_{match.group(1)}" if match else None
+
+
 async def create_user(body: UserCreate, db: AsyncSession = Depends(get_db)) -> UserResponse:
-    user_exists = await User.find_by_email(email=body.email, db=db)
-    
-    if user_exists is not None:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User with this email is already exist")
-    
-    username_exists = await User.find_by_username(username=body.username, db=db)
-    
-    if username_exists is not None:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"username {body.username} is already exist. Choose another username")
+    # checked up front so duplicates are refused without paying for a bcrypt hash
+    email_taken, username_taken = await User.find_taken_identifiers(email=body.email, username=body.username, db=db)
+
+    if email_taken:
+        raise _email_taken()
+
+    if username_taken:
+        raise _username_taken(body.username)
 
     user_data = body.model_dump(exclude={"password_confirm"})
-    user_data["password"] = get_password_hash(user_data["password"])
+    user_data["password"] = await get_password_hash_async(user_data["password"])
 
     new_user = User(**user_data)
-    await new_user.save(db=db)
+    db.add(new_user)
+    try:
+        # a single INSERT ... RETURNING; the unique constraints catch a concurrent signup
+        await db.commit()
+    except IntegrityError as ex:
+        await db.rollback()
+        constraint = violated_constraint(ex)
+        if constraint == "ix_user_email":
+            raise _email_taken() from ex
+        if constraint == "ix_user_username":
+            raise _username_taken(body.username) from ex
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="User conflicts with an existing one") from ex
+
+    replica_router.mark_write(new_user.email)
 
     new_user_dict = {
         'first_name': new_user.first_name,
@@ -51,7 +88,7 @@ async def create_token_for_user(body: OAuth2PasswordRequestForm = Depends(), db:
     
     new_user = UserBase.model_validate(user, from_attributes=True)
 
-    token_pair = create_token_pair(user=new_user)
+    token_pair = create_token_pair(user=new_user, generation=user.token_generation)
 
     #add_refresh_token_cookie(response=response, token=token_pair.refresh.token)
 
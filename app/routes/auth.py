@@ -3,11 +3,12 @@ from fastapi.security import OAuth2PasswordRequestForm
 from app.database.connections import get_db
 from app.schemas.user_schema import UserResponse, UserCreate
 from app.schemas.token_schema import TokenPair
-from app.models.user import User
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repository.user import create_user, create_token_for_user
-from app.services.auth import oauth2_scheme, add_token_to_blacklist
+from app.services.auth import oauth2_scheme, add_token_to_blacklist, revoke_all_user_tokens
 from app.services.auth import get_current_user, get_token_of_auth_user
+from app.services.principal_cache import Principal
+from app.services.throttle import throttle_login
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -19,7 +20,7 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     return new_user
 
 
-@router.post("/login", status_code=status.HTTP_200_OK)
+@router.post("/login", status_code=status.HTTP_200_OK, dependencies=[Depends(throttle_login)])
 async def login(body: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     access_token = await create_token_for_user(body=body, db=db,) #response=Response)
 
@@ -32,8 +33,13 @@ async  def logout(token: str = Depends(get_token_of_auth_user), db: AsyncSession
     return await add_token_to_blacklist(token=token, db=db)
 
 
+@router.post("/logout_all", status_code=status.HTTP_200_OK)
+async def logout_all(user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    return await revoke_all_user_tokens(user=user, db=db)
+
+
 @router.get("/protected_data")
-async def read_user(user: User = Depends(get_current_user)):
+async def read_user(user: Principal = Depends(get_current_user)):
     return {f"This is protected data and available for {user.email}"}
 
 
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, status
+
+from app.services.revocation import revocation_cache
+from app.services.principal_cache import principal_cache
+from app.services.hash import hash_executor
+from app.services.blacklist_sweeper import sweeper_stats
+from app.services.throttle import login_throttle
+from app.database.connections import engine
+from app.database.pool import pool_stats
+from app.database.replicas import replica_router
+
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/revocation", status_code=status.HTTP_200_OK)
+async def get_revocation_stats():
+    return revocation_cache.stats
+
+
+@router.get("/principal", status_code=status.HTTP_200_OK)
+async def get_principal_cache_stats():
+    return principal_cache.stats
+
+
+@router.get("/hashing", status_code=status.HTTP_200_OK)
+async def get_hashing_stats():
+    return hash_executor.stats
+
+
+@router.get("/blacklist_sweeper", status_code=status.HTTP_200_OK)
+async def get_blacklist_sweeper_stats():
+    return sweeper_stats
+
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+async def get_pool_stats():
+    return pool_stats(engine.pool)
+
+
+@router.get("/login_throttle", status_code=status.HTTP_200_OK)
+async def get_login_throttle_stats():
+    return login_throttle.stats
+
+
+@router.get("/replicas", status_code=status.HTTP_200_OK)
+async def get_replica_stats():
+    return replica_router.stats
@@ -1,67 +1,271 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from datetime import datetime
 from app.database.connections import get_db
-from app.schemas.tasks_schema import TaskCreate, TaskResponse, TaskUpdate
+from app.database.replicas import get_read_db
+from app.schemas.tasks_schema import TaskCreate, TaskResponse, TaskUpdate, TaskPage, TaskListSpec, TaskSearchPage, TaskSearchResult, task_list_adapter
+from app.schemas.tasks_schema import TaskBatchUpdateItem, TaskBatchUpdateResult, TaskBatchDelete, TaskBatchDeleteResult
 from app.models.user import User
+from app.models.task_model import Task
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.repository.task import create_new_task, get_tasks, get_task_by_id, get_all_tasks_and_their_user, update_task, delete_task
+from app.repository.task import create_new_task, create_new_tasks, get_tasks_page, get_task_by_id, get_all_tasks_and_their_user, update_task, delete_task
+from app.repository.task import update_tasks, delete_tasks
+from app.repository.task import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SEARCH_MAX_OFFSET, search_tasks, stream_all_tasks_and_their_user
 from app.services.auth import get_current_user
+from app.services.principal_cache import Principal
+from app.exceptions.http_exceptions import BadRequestException, NotFoundException, PreconditionFailedException
+from app.middleware.timing import phase
+from app.config import settings
+import orjson
 import uuid
 
 
 router = APIRouter(prefix="/Tasks", tags=["tasks"])
 
 
+def _json(content: bytes, status_code: int = status.HTTP_200_OK, headers: dict | None = None) -> Response:
+    # list endpoints serialize in one pydantic-core pass and skip FastAPI's response_model re-validation
+    return Response(content=content, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def _tasks_etag(user: Principal, version: int) -> dict:
+    # clients must revalidate, but a matching ETag costs one indexed lookup and no task rows
+    return {"ETag": f'W/"{user.id.hex}-{version}"', "Cache-Control": "private, no-cache"}
+
+
+def _task_etag(task_id: uuid.UUID, version: int) -> dict:
+    return {"ETag": f'"{task_id.hex}-{version}"', "Cache-Control": "private, no-cache"}
+
+
+def _if_match_version(request: Request, task_id: uuid.UUID) -> int | None:
+    # the task version an If-Match header names; None when the client set no precondition
+    if_match = request.headers.get("if-match")
+    if if_match is None or if_match.strip() == "*":
+        return None
+    prefix = f'"{task_id.hex}-'
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if tag.startswith(prefix) and tag.endswith('"') and tag[len(prefix):-1].isdigit():
+            return int(tag[len(prefix):-1])
+    raise PreconditionFailedException(detail="If-Match does not name a version of this task")
+
+
+def _not_modified(request: Request, headers: dict) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = headers["ETag"].removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
 @router.post("/task_create", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-async def create_task(body: TaskCreate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    new_task = await create_new_task(body=body, user=user, db=db)
+async def create_task(body: TaskCreate, user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    with phase("db"):
+        new_task = await create_new_task(body=body, user=user, db=db)
+
+    with phase("serialize"):
+        content = TaskResponse.model_validate(new_task, from_attributes=True).model_dump_json().encode()
+
+    return _json(content, status_code=status.HTTP_201_CREATED)
+
 
-    return new_task
+@router.post("/tasks_bulk_create", response_model=list[TaskResponse], status_code=status.HTTP_201_CREATED)
+async def create_tasks(body: list[TaskCreate], user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
 
+    if not body or len(body) > settings.tasks_bulk_max:
+        raise BadRequestException(detail=f"Send between 1 and {settings.tasks_bulk_max} tasks per request")
 
-@router.get("/tasks", response_model=list[TaskResponse], status_code=status.HTTP_200_OK)
-async def get_user_tasks(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    with phase("db"):
+        new_tasks = await create_new_tasks(bodies=body, user=user, db=db)
 
-    tasks = await get_tasks(user=user, db=db)
+    with phase("serialize"):
+        items = task_list_adapter.validate_python(new_tasks, from_attributes=True)
+        content = task_list_adapter.dump_json(items)
 
-    if not tasks:
+    return _json(content, status_code=status.HTTP_201_CREATED)
+
+
+def task_list_spec(created_after: datetime | None = None, created_before: datetime | None = None,
+                   updated_after: datetime | None = None, updated_before: datetime | None = None,
+                   title_prefix: str | None = None,
+                   sort: str = Query(default="created_at", description="created_at, updated_at or title"),
+                   order: str = Query(default="asc", description="asc or desc")) -> TaskListSpec:
+    try:
+        return TaskListSpec(created_after=created_after, created_before=created_before,
+                            updated_after=updated_after, updated_before=updated_before,
+                            title_prefix=title_prefix, sort=sort, order=order)
+    except ValidationError as ex:
+        raise RequestValidationError([{**error, "loc": ("query", *error["loc"])} for error in ex.errors()])
+
+
+@router.get("/tasks", response_model=TaskPage, status_code=status.HTTP_200_OK)
+async def get_user_tasks(request: Request, cursor: str | None = None,
+                         limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                         spec: TaskListSpec = Depends(task_list_spec),
+                         user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_read_db)):
+
+    with phase("db"):
+        headers = _tasks_etag(user, await User.get_tasks_version(db=db, user_id=user.id))
+
+    if _not_modified(request, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    with phase("db"):
+        tasks, next_cursor = await get_tasks_page(user=user, db=db, cursor=cursor, limit=limit, spec=spec)
+
+    if not tasks and cursor is None and spec == TaskListSpec():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User didn't create tasks"
         )
 
-    return tasks
+    with phase("serialize"):
+        page = TaskPage(items=task_list_adapter.validate_python(tasks, from_attributes=True), next_cursor=next_cursor)
+        content = page.model_dump_json().encode()
+
+    return _json(content, headers=headers)
+
+@router.get("/search", response_model=TaskSearchPage, status_code=status.HTTP_200_OK)
+async def search_user_tasks(q: str = Query(min_length=1, max_length=200),
+                            limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                            offset: int = Query(default=0, ge=0, le=SEARCH_MAX_OFFSET),
+                            user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_read_db)):
+
+    with phase("db"):
+        rows, next_offset = await search_tasks(user=user, db=db, query=q, limit=limit, offset=offset)
+
+    with phase("serialize"):
+        items = [TaskSearchResult(rank=rank, **{field: getattr(task, field) for field in TaskResponse.model_fields})
+                 for task, rank in rows]
+        content = TaskSearchPage(items=items, next_offset=next_offset).model_dump_json().encode()
+
+    return _json(content)
+
 
 @router.get("/task/{task_id}", response_model=TaskResponse, status_code=status.HTTP_200_OK)
-async def get_user_task_by_task_id(task_id: uuid.UUID, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def get_user_task_by_task_id(request: Request, task_id: uuid.UUID, user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    # served by the primary: its ETag is sent back as If-Match, and a lagging replica's version would fail with 412
+
+    if "if-none-match" in request.headers:
+        # revalidation reads only the version; a match never loads the row
+        with phase("db"):
+            version = await Task.get_version(db=db, user=user, task_id=task_id)
+
+        if version is None:
+            raise NotFoundException(detail="Task not found")
+
+        if _not_modified(request, _task_etag(task_id, version)):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_task_etag(task_id, version))
+
+    with phase("db"):
+        task = await get_task_by_id(task_id=task_id, user=user, db=db)
+
+    if task is None:
+        raise NotFoundException(detail="Task not found")
 
-    task = await get_task_by_id(task_id=task_id, user=user, db=db)
+    headers = _task_etag(task.id, task.version)
 
-    return task
+    with phase("serialize"):
+        content = TaskResponse.model_validate(task, from_attributes=True).model_dump_json().encode()
+
+    return _json(content, headers=headers)
 
 
 @router.get("/tasks_and_their_users", status_code=status.HTTP_200_OK)
-async def get_tasks_and_users(db: AsyncSession = Depends(get_db)):
+async def get_tasks_and_users(db: AsyncSession = Depends(get_read_db)):
 
     tasks = await get_all_tasks_and_their_user(db=db)
 
     return tasks
 
 
+async def _tasks_and_users_ndjson(db: AsyncSession):
+    # dependencies exit before a streaming body is sent, so the stream owns closing the session
+    try:
+        async for rows in stream_all_tasks_and_their_user(db=db):
+            yield b"".join(
+                orjson.dumps({
+                    "id": row["id"],
+                    "title": row["title"],
+                    "description": row["description"],
+                    "user_id": row["user_id"],
+                    "created_at": row["created_at"],
+                    "updated_at": row["updated_at"],
+                    "user": {"email": row["email"]},
+                }) + b"\n"
+                for row in rows
+            )
+    finally:
+        await db.close()
+
+
+@router.get("/tasks_and_their_users/export", status_code=status.HTTP_200_OK)
+async def export_tasks_and_users(db: AsyncSession = Depends(get_read_db)):
+
+    return StreamingResponse(_tasks_and_users_ndjson(db=db), media_type="application/x-ndjson")
+
+
 @router.patch("/update_task/{task_id}", status_code=status.HTTP_200_OK)
-async def update_task_by_id(task_id: uuid.UUID, body: TaskUpdate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def update_task_by_id(request: Request, response: Response, task_id: uuid.UUID, body: TaskUpdate, user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
 
-    updatedTask = await update_task(task_id=task_id, body=body, user=user, db=db)
+    expected_version = _if_match_version(request, task_id)
+
+    with phase("db"):
+        updatedTask = await update_task(task_id=task_id, body=body, user=user, db=db, expected_version=expected_version)
+
+    if updatedTask is None:
+        raise NotFoundException(detail="Task not found")
+
+    response.headers.update(_task_etag(task_id, updatedTask.Task.version))
 
     return {"updated task" : updatedTask._asdict()}
 
 
 
 @router.delete("/delete_task{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_task_by_id(task_id: uuid.UUID, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def delete_task_by_id(task_id: uuid.UUID, user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+
+    with phase("db"):
+        return await delete_task(task_id=task_id, user=user, db=db)
+
+
+def _check_batch(ids: list[uuid.UUID]) -> None:
+    if not ids or len(ids) > settings.tasks_bulk_max:
+        raise BadRequestException(detail=f"Send between 1 and {settings.tasks_bulk_max} tasks per request")
+    if len(set(ids)) != len(ids):
+        raise BadRequestException(detail="Each task id may appear only once per request")
+
+
+@router.patch("/tasks_bulk_update", response_model=TaskBatchUpdateResult, status_code=status.HTTP_200_OK)
+async def update_tasks_by_id(body: list[TaskBatchUpdateItem], user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+
+    _check_batch([patch.id for patch in body])
+
+    with phase("db"):
+        updated = await update_tasks(patches=body, user=user, db=db)
+
+    updated_ids = {task.id for task in updated}
+
+    with phase("serialize"):
+        result = TaskBatchUpdateResult(updated=task_list_adapter.validate_python(updated, from_attributes=True),
+                                       not_found=[patch.id for patch in body if patch.id not in updated_ids])
+        content = result.model_dump_json().encode()
+
+    return _json(content)
 
-    return await delete_task(task_id=task_id, user=user, db=db)
 
+@router.post("/tasks_bulk_delete", response_model=TaskBatchDeleteResult, status_code=status.HTTP_200_OK)
+async def delete_tasks_by_id(body: TaskBatchDelete, user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
 
+    _check_batch(body.ids)
 
+    with phase("db"):
+        deleted = set(await delete_tasks(task_ids=body.ids, user=user, db=db))
 
+    return TaskBatchDeleteResult(deleted=[task_id for task_id in body.ids if task_id in deleted],
+                                 not_found=[task_id for task_id in body.ids if task_id not in deleted])
 
@@ -1,7 +1,7 @@
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, model_validator
+from datetime import datetime, timezone
 from uuid import UUID
-from typing import Optional
+from typing import Literal, Optional
 
 
 class TaskResponse(BaseModel):
@@ -13,6 +13,51 @@ class TaskResponse(BaseModel):
     updated_at: datetime
 
 
+class TaskPage(BaseModel):
+    items: list[TaskResponse]
+    next_cursor: Optional[str] = None
+
+
+class TaskListSpec(BaseModel):
+    """Filters and ordering for task listings; every sort key has a (user_id, key, id) index."""
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    title_prefix: Optional[str] = Field(default=None, min_length=1, max_length=200)
+    sort: Literal["created_at", "updated_at", "title"] = "created_at"
+    order: Literal["asc", "desc"] = "asc"
+
+    @field_validator("created_after", "created_before", "updated_after", "updated_before")
+    @classmethod
+    def to_naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # the timestamp columns hold naive UTC; asyncpg refuses to compare them with an aware value
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @model_validator(mode='after')
+    def check_ranges(self):
+        for name in ("created", "updated"):
+            after, before = getattr(self, f"{name}_after"), getattr(self, f"{name}_before")
+            if after is not None and before is not None and after >= before:
+                raise ValueError(f"{name}_after must be earlier than {name}_before")
+        return self
+
+
+class TaskSearchResult(TaskResponse):
+    rank: float
+
+
+class TaskSearchPage(BaseModel):
+    items: list[TaskSearchResult]
+    next_offset: Optional[int] = None
+
+
+# built once: validating a whole list in one call is far cheaper than per-item validation
+task_list_adapter = TypeAdapter(list[TaskResponse])
+
+
 class TaskCreate(BaseModel):
     title: str
     description: str
@@ -29,4 +74,22 @@ class TaskDelete(BaseModel):
     id: UUID
 
 
+class TaskBatchUpdateItem(TaskUpdate):
+    id: UUID
+
+
+class TaskBatchDelete(BaseModel):
+    ids: list[UUID]
+
+
+class TaskBatchUpdateResult(BaseModel):
+    updated: list[TaskResponse]
+    not_found: list[UUID]
+
+
+class TaskBatchDeleteResult(BaseModel):
+    deleted: list[UUID]
+    not_found: list[UUID]
+
+
     
\ No newline at end of file
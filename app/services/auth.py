@@ -4,9 +4,9 @@ from datetime import timedelta, datetime, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from jose import jwt, JWTError
+from jose import JWTError
 from fastapi import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,13 +14,16 @@ from app.schemas.token_schema import JwtTokenSchema, TokenPair
 from app.schemas.user_schema import UserBase
 from app.models.user import User
 from app.models.blacklisted_model import BlacklistedToken
-from app.services.hash import verify_password
+from app.services.hash import verify_password_async
+from app.services.revocation import revocation_cache
+from app.services.principal_cache import Principal, principal_cache
+from app.services.token_codec import token_codec
 from app.exceptions.http_exceptions import AuthFailedException
 from app.database.connections import get_db
+from app.database.replicas import replica_router
+from app.middleware.timing import phase
 import logging
 
-from app.config import settings
-
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -33,6 +36,7 @@ SUB = "sub"
 EXP = "exp"
 IAT = "iat"
 JTI = "jti"
+GEN = "gen"
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 httpBearer = HTTPBearer()
@@ -40,10 +44,9 @@ httpBearer = HTTPBearer()
 def _create_access_token(payload: dict, minutes: int | None = None) -> JwtTokenSchema:
     expire = datetime.now(timezone.utc) + timedelta(minutes=minutes or ACCESS_TOKEN_EXPIRES_MINUTES)
 
-    payload[EXP] = expire
+    payload[EXP] = int(expire.timestamp())
 
-    token = JwtTokenSchema(token=jwt.encode(payload, settings.secret_key_jwt,
-                           algorithm=settings.algorithm),
+    token = JwtTokenSchema(token=token_codec.encode(payload),
                            payload=payload, expire=expire)
 
     return token
@@ -52,17 +55,17 @@ def _create_access_token(payload: dict, minutes: int | None = None) -> JwtTokenS
 def _create_refresh_token(payload: dict) -> JwtTokenSchema:
     expire = datetime.now(timezone.utc) + timedelta(minutes=REFRESH_TOKEN_EXPIRES_MINUTES)
 
-    payload[EXP] = expire
+    payload[EXP] = int(expire.timestamp())
 
-    token = JwtTokenSchema(token=jwt.encode(payload, settings.secret_key_jwt, algorithm=settings.algorithm),
+    token = JwtTokenSchema(token=token_codec.encode(payload),
                            expire=expire,
                            payload=payload)
 
     return token
 
 
-def create_token_pair(user: UserBase) -> TokenPair:
-    payload = {SUB: str(user.email), JTI: str(uuid.uuid4()), IAT: datetime.now(timezone.utc)}
+def create_token_pair(user: UserBase, generation: int = 0) -> TokenPair:
+    payload = {SUB: str(user.email), JTI: uuid.uuid4().hex, IAT: int(datetime.now(timezone.utc).timestamp()), GEN: generation}
 
     return TokenPair(access=_create_access_token(payload={**payload}),
                      refresh=_create_refresh_token(payload={**payload}))
@@ -70,10 +73,12 @@ def create_token_pair(user: UserBase) -> TokenPair:
 
 async def decode_access_token(token: str, db: AsyncSession):
     try:
-        payload = jwt.decode(token, settings.secret_key_jwt, algorithms=[settings.algorithm])
+        with phase("jwt"):
+            payload = token_codec.decode(token)
         jti = payload.get(JTI)
-        black_list_token = await BlacklistedToken.find_by_id(db=db, id=payload[JTI])
-        if black_list_token:
+        with phase("revocation"):
+            revoked = await revocation_cache.is_revoked(db=db, jti=payload[JTI])
+        if revoked:
             logger.info(f"Token {jti} is blacklisted")
             raise JWTError("Token is blacklisted")
     except JWTError as e:
@@ -88,7 +93,7 @@ async def decode_access_token(token: str, db: AsyncSession):
 
 def refresh_token_state(token: str) -> dict:
     try:
-        payload = jwt.decode(token, settings.secret_key_jwt, algorithms=[settings.algorithm])
+        payload = token_codec.decode(token)
     except JWTError:
         raise AuthFailedException()
 
@@ -123,6 +128,9 @@ async def add_token_to_blacklist(token: str, db: AsyncSession = Depends(get_db))
         black_listed = BlacklistedToken(id=payload[JTI], expire=datetime.fromtimestamp(payload[EXP], tz=timezone.utc))
     
         await black_listed.save(db=db)
+        replica_router.mark_write(payload[SUB])
+        revocation_cache.add(black_listed.id)
+        principal_cache.invalidate(payload[SUB])
 
         return {"msg": "Successfully logout"}
     except Exception as e:
@@ -134,6 +142,19 @@ async def add_token_to_blacklist(token: str, db: AsyncSession = Depends(get_db))
         
 
 
+async def revoke_all_user_tokens(user: Principal, db: AsyncSession):
+
+    # tokens carry the generation they were issued under; bumping it invalidates all of them at once
+    await db.execute(update(User).where(User.id == user.id).values(token_generation=User.token_generation + 1))
+    await db.commit()
+    replica_router.mark_write(user.email)
+
+    principal_cache.invalidate(user.email)
+
+    return {"msg": "Successfully logout from all sessions"}
+
+
+
 #async def is_token_blacklisted(token: str, db: AsyncSession = Depends(get_db)):
 #    payload = await decode_access_token(token=token, db=db)
 #    
@@ -148,12 +169,13 @@ async def add_token_to_blacklist(token: str, db: AsyncSession = Depends(get_db))
 
 async def authenticate(email: str, password: str, db: AsyncSession):
     user = await User.find_by_email(db=db, email=email)
-    if not user or not verify_password(password, user.password):
+    if not user or not await verify_password_async(password, user.password):
         return False
     return user
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+# revocation and token generation are read from the primary: a lagging replica would accept a token just revoked
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> Principal:
 
 #    if await is_token_blacklisted(token, db):
 #        raise HTTPException(
@@ -175,10 +197,21 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
     
    
     
-    user = await User.find_by_email(email=email, db=db)
-    if user is None:
-        raise AuthFailedException()
-    return user
+    with phase("user"):
+        principal = principal_cache.get(email)
+        if principal is None:
+            user = await User.find_by_email(email=email, db=db)
+            if user is None:
+                raise AuthFailedException()
+            principal = Principal.from_user(user)
+            principal_cache.put(email, principal)
+
+    if payload.get(GEN, 0) < principal.token_generation:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+    return principal
 
 
 
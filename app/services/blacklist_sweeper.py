@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.blacklisted_model import BlacklistedToken
+from app.database.connections import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+
+sweeper_stats = {"runs": 0, "last_deleted": 0, "total_deleted": 0}
+
+
+async def purge_expired_tokens(db: AsyncSession, batch_size: int) -> int:
+    now = datetime.now(timezone.utc)
+    total = 0
+
+    while True:
+        # one short transaction per batch keeps row locks brief on a busy table
+        expired = (
+            select(BlacklistedToken.id)
+            .where(BlacklistedToken.expire < now)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            delete(BlacklistedToken)
+            .where(BlacklistedToken.id.in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+
+
+async def run_blacklist_sweeper(interval: float, batch_size: int):
+    while True:
+        try:
+            async with async_session_maker() as db:
+                deleted = await purge_expired_tokens(db=db, batch_size=batch_size)
+            sweeper_stats["runs"] += 1
+            sweeper_stats["last_deleted"] = deleted
+            sweeper_stats["total_deleted"] += deleted
+            logger.info(f"Blacklist sweeper deleted {deleted} expired tokens")
+        except Exception as ex:
+            # anything escaping here would end the task silently and surface only at shutdown
+            logger.error(f"Blacklist sweeper failed: {ex!r}")
+
+        await asyncio.sleep(interval)
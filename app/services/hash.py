@@ -1,5 +1,10 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
+from app.config import settings
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -10,3 +15,70 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+
+class HashExecutor:
+    """Runs bcrypt work in a thread or process pool with a concurrency cap.
+
+    Callers over the cap wait on a semaphore; ``stats["waiting"]`` is the
+    current queue depth and ``stats["max_waiting"]`` its high-water mark.
+    """
+
+    def __init__(self, kind: str, workers: int, max_concurrency: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.stats = {"waiting": 0, "max_waiting": 0, "running": 0, "completed": 0}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            pool_class = ProcessPoolExecutor if self.kind == "process" else ThreadPoolExecutor
+            self._executor = pool_class(max_workers=self.workers)
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, func, *args):
+        semaphore = self._get_semaphore()
+
+        self.stats["waiting"] += 1
+        self.stats["max_waiting"] = max(self.stats["max_waiting"], self.stats["waiting"])
+        try:
+            await semaphore.acquire()
+        finally:
+            self.stats["waiting"] -= 1
+
+        self.stats["running"] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.stats["running"] -= 1
+            self.stats["completed"] += 1
+            semaphore.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hash_executor = HashExecutor(
+    kind=settings.hash_executor,
+    workers=settings.hash_workers,
+    max_concurrency=settings.hash_max_concurrency,
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await hash_executor.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hash_executor.run(verify_password, plain_password, hashed_password)
@@ -0,0 +1,68 @@
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import event, inspect
+
+from app.models.user import User
+from app.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: uuid.UUID
+    email: str
+    is_active: bool
+    token_generation: int
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, is_active=user.is_active, token_generation=user.token_generation)
+
+
+class PrincipalCache:
+    """Bounded LRU of authenticated principals keyed by token subject.
+
+    Entries live for ``ttl`` seconds, which is the longest a change made by
+    another worker can go unseen here; local changes invalidate immediately.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.reset()
+
+    def reset(self) -> None:
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, subject: str) -> Principal | None:
+        entry = self._entries.get(subject)
+        if entry is None or entry[0] <= time.monotonic():
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(subject)
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def put(self, subject: str, principal: Principal) -> None:
+        self._entries[subject] = (time.monotonic() + self.ttl, principal)
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str) -> None:
+        if self._entries.pop(subject, None) is not None:
+            self.stats["invalidations"] += 1
+
+
+principal_cache = PrincipalCache(max_size=settings.principal_cache_size, ttl=settings.principal_cache_ttl_seconds)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    principal_cache.invalidate(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted:
+        principal_cache.invalidate(old_email)
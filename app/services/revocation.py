@@ -0,0 +1,112 @@
+import hashlib
+import math
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.blacklisted_model import BlacklistedToken
+from app.config import settings
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationCache:
+    """Answers "is this jti revoked?" without SQL for the common case.
+
+    The bloom filter holds every blacklisted jti and is rebuilt from the
+    table every ``refresh_seconds``, which also bounds how long a logout on
+    another worker can go unseen here. Bloom hits are confirmed against the
+    database and the "not revoked" answers are kept for ``negative_ttl``.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, negative_ttl: float,
+                 negative_max_size: int, refresh_seconds: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.negative_ttl = negative_ttl
+        self.negative_max_size = negative_max_size
+        self.refresh_seconds = refresh_seconds
+        self.reset()
+
+    def reset(self) -> None:
+        self._bloom: BloomFilter | None = None
+        self._loaded_at = 0.0
+        self._added_since_rebuild: set[str] = set()
+        self._not_revoked: OrderedDict[str, float] = OrderedDict()
+        self.stats = {"bloom_negative": 0, "negative_cache_hit": 0, "db_lookup": 0, "revoked": 0, "rebuilds": 0}
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        self._loaded_at = time.monotonic()
+        self._added_since_rebuild = set()
+
+        result = await db.execute(select(BlacklistedToken.id))
+        ids = result.scalars().all()
+
+        bloom = BloomFilter(capacity=max(self.capacity, 2 * len(ids)), error_rate=self.error_rate)
+        # logouts committed while the SELECT was running may be missing from its result
+        for jti in (*ids, *self._added_since_rebuild):
+            bloom.add(jti)
+
+        self._bloom = bloom
+        self._not_revoked.clear()
+        self.stats["rebuilds"] += 1
+
+    def add(self, jti: str) -> None:
+        self._added_since_rebuild.add(jti)
+        self._not_revoked.pop(jti, None)
+        if self._bloom is not None:
+            self._bloom.add(jti)
+
+    async def is_revoked(self, db: AsyncSession, jti: str) -> bool:
+        now = time.monotonic()
+        if self._bloom is None or now - self._loaded_at > self.refresh_seconds:
+            await self.rebuild(db=db)
+
+        if jti not in self._bloom:
+            self.stats["bloom_negative"] += 1
+            return False
+
+        deadline = self._not_revoked.get(jti)
+        if deadline is not None and deadline > now:
+            self.stats["negative_cache_hit"] += 1
+            return False
+
+        self.stats["db_lookup"] += 1
+        if await BlacklistedToken.find_by_id(db=db, id=jti) is not None:
+            self.stats["revoked"] += 1
+            return True
+
+        self._not_revoked[jti] = now + self.negative_ttl
+        self._not_revoked.move_to_end(jti)
+        while len(self._not_revoked) > self.negative_max_size:
+            self._not_revoked.popitem(last=False)
+        return False
+
+
+revocation_cache = RevocationCache(
+    capacity=settings.revocation_bloom_capacity,
+    error_rate=settings.revocation_bloom_error_rate,
+    negative_ttl=settings.revocation_negative_ttl_seconds,
+    negative_max_size=settings.revocation_negative_cache_size,
+    refresh_seconds=settings.revocation_refresh_seconds,
+)
@@ -0,0 +1,94 @@
+import math
+import time
+from collections import OrderedDict
+
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordRequestForm
+
+from app.config import settings
+from app.exceptions.http_exceptions import TooManyRequestsException
+
+
+# rates are configured per minute, so no client is ever told to wait longer than that
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets holding up to ``burst`` tokens, refilled at ``rate`` per second.
+
+    Only the ``max_keys`` most recently seen keys are tracked, so memory stays
+    bounded during a spray across many addresses or accounts.
+    """
+
+    def __init__(self, burst: int, rate: float, max_keys: int):
+        self.burst = burst
+        self.rate = rate
+        self.max_keys = max_keys
+        self.reset()
+
+    def reset(self) -> None:
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        """Take one token for ``key``; return 0 if allowed, else seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            retry_after = 0.0
+        else:
+            self._buckets[key] = (tokens, now)
+            retry_after = min((1 - tokens) / self.rate, MAX_RETRY_AFTER_SECONDS) if self.rate > 0 else MAX_RETRY_AFTER_SECONDS
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class LoginThrottle:
+    """Limits login attempts per client address and per account before any password is checked."""
+
+    def __init__(self, by_ip: TokenBucketLimiter, by_account: TokenBucketLimiter, enabled: bool = True):
+        self.by_ip = by_ip
+        self.by_account = by_account
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self) -> None:
+        self.by_ip.reset()
+        self.by_account.reset()
+        self.stats = {"allowed": 0, "throttled_ip": 0, "throttled_account": 0}
+
+    def check(self, ip: str, account: str) -> None:
+        if not self.enabled:
+            return
+        retry_after = self.by_ip.acquire(ip)
+        if retry_after:
+            self.stats["throttled_ip"] += 1
+            raise TooManyRequestsException(retry_after=math.ceil(retry_after))
+        retry_after = self.by_account.acquire(account.strip().lower())
+        if retry_after:
+            self.stats["throttled_account"] += 1
+            raise TooManyRequestsException(retry_after=math.ceil(retry_after))
+        self.stats["allowed"] += 1
+
+
+login_throttle = LoginThrottle(
+    by_ip=TokenBucketLimiter(
+        burst=settings.login_throttle_ip_burst,
+        rate=settings.login_throttle_ip_per_minute / 60,
+        max_keys=settings.login_throttle_max_keys,
+    ),
+    by_account=TokenBucketLimiter(
+        burst=settings.login_throttle_account_burst,
+        rate=settings.login_throttle_account_per_minute / 60,
+        max_keys=settings.login_throttle_max_keys,
+    ),
+    enabled=settings.login_throttle_enabled,
+)
+
+
+async def throttle_login(request: Request, body: OAuth2PasswordRequestForm = Depends()) -> None:
+    ip = request.client.host if request.client else "unknown"
+    login_throttle.check(ip=ip, account=body.username)
@@ -0,0 +1,68 @@
+from jose import jwk, jwt, JWTError
+from jose.constants import ALGORITHMS
+
+from app.config import settings
+
+
+class TokenCodec:
+    """Encodes and verifies JWTs with key objects that are parsed only once.
+
+    Tokens are signed with the active key and name it in the ``kid`` header.
+    Verification picks the key by ``kid``, so after a rotation the previous
+    keys keep verifying the tokens they signed until those expire. Tokens
+    without a ``kid`` are checked against the active key.
+    """
+
+    def __init__(self, algorithm: str, signing_key: str, active_kid: str, previous_keys: dict[str, str] | None = None):
+        if algorithm not in ALGORITHMS.SUPPORTED:
+            raise ValueError(f"Unsupported JWT algorithm {algorithm}")
+
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self._headers = {"kid": active_kid}
+        self._signing_key = jwk.construct(signing_key, algorithm)
+        self._verifying_keys = {kid: self._verifying_key(jwk.construct(key, algorithm))
+                                for kid, key in (previous_keys or {}).items()}
+        self._verifying_keys[active_kid] = self._verifying_key(self._signing_key)
+
+    def _verifying_key(self, key):
+        return key if self.algorithm in ALGORITHMS.HMAC else key.public_key()
+
+    def encode(self, claims: dict) -> str:
+        return jwt.encode(claims, self._signing_key, algorithm=self.algorithm, headers=self._headers)
+
+    def decode(self, token: str) -> dict:
+        key = self._verifying_keys[self.active_kid]
+        if len(self._verifying_keys) > 1:
+            kid = jwt.get_unverified_header(token).get("kid", self.active_kid)
+            if kid not in self._verifying_keys:
+                raise JWTError(f"Unknown key id {kid}")
+            key = self._verifying_keys[kid]
+
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+
+    @classmethod
+    def from_settings(cls, settings) -> "TokenCodec":
+        # HMAC keys are the secrets themselves, RSA/EC keys are read from PEM files
+        if settings.algorithm in ALGORITHMS.HMAC:
+            signing_key = settings.secret_key_jwt
+            load = lambda value: value
+        else:
+            load = _read_key_file
+            signing_key = load(settings.jwt_private_key_file)
+
+        previous_keys = {}
+        for entry in filter(None, settings.jwt_previous_keys.split(",")):
+            kid, _, value = entry.strip().partition("=")
+            previous_keys[kid] = load(value)
+
+        return cls(algorithm=settings.algorithm, signing_key=signing_key,
+                   active_kid=settings.jwt_kid, previous_keys=previous_keys)
+
+
+def _read_key_file(path: str) -> str:
+    with open(path) as fp:
+        return fp.read()
+
+
+token_codec = TokenCodec.from_settings(settings)
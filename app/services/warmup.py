@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import time
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.models.user import User
+from app.models.task_model import Task
+from app.models.blacklisted_model import BlacklistedToken
+from app.services.hash import get_password_hash_async, verify_password_async
+from app.services.token_codec import token_codec
+
+
+logger = logging.getLogger(__name__)
+
+
+async def open_connections(engine: AsyncEngine, count: int) -> None:
+    """Open ``count`` connections at once so they sit in the pool before the first request."""
+    # overflow connections are closed on checkin, and pools without a size keep nothing
+    count = min(count, engine.pool.size() if hasattr(engine.pool, "size") else 1)
+    opened = 0
+    all_open = asyncio.Event()
+
+    async def touch():
+        nonlocal opened
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            opened += 1
+            if opened == count:
+                all_open.set()
+            # hold on to it, or the next checkout would just reuse this connection
+            await all_open.wait()
+
+    touches = [asyncio.ensure_future(touch()) for _ in range(count)]
+    try:
+        await asyncio.wait_for(asyncio.gather(*touches), timeout=30)
+    finally:
+        # after a failed connect the others would wait on all_open forever, holding their connections
+        for touch_task in touches:
+            touch_task.cancel()
+        await asyncio.gather(*touches, return_exceptions=True)
+
+
+async def prime_statements(db: AsyncSession) -> None:
+    """Run the per-request statements once so their compiled forms are cached on the engine."""
+    nobody = SimpleNamespace(id=uuid.UUID(int=0), email="")
+    await User.find_by_email(db=db, email="")
+    await User.get_tasks_version(db=db, user_id=nobody.id)
+    await BlacklistedToken.find_by_id(db=db, id="")
+    await Task.find_page_by_user(db=db, user=nobody, limit=1)
+    await Task.get_version(db=db, user=nobody, task_id=nobody.id)
+
+
+async def warm_up_crypto() -> None:
+    """Start the hash workers and build the JWT keys' first signatures outside any request."""
+    hashed = await get_password_hash_async("warm-up")
+    await verify_password_async("warm-up", hashed)
+    now = int(time.time())
+    token_codec.decode(token_codec.encode({"sub": "warm-up", "iat": now, "exp": now + 60}))
+
+
+async def warm_up(engines: list[AsyncEngine], connections: int) -> None:
+    for engine in engines:
+        try:
+            if connections > 0:
+                await open_connections(engine, connections)
+            async with async_sessionmaker(bind=engine, class_=AsyncSession)() as db:
+                await prime_statements(db)
+        except Exception as ex:
+            # a cold start is slower, not broken
+            logger.warning(f"Could not warm up {engine.url.render_as_string()}: {ex}")
+
+    try:
+        await warm_up_crypto()
+    except Exception as ex:
+        logger.warning(f"Could not warm up hashing and tokens: {ex}")
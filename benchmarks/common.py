@@ -0,0 +1,93 @@
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.database.base_class import Base
+
+# Import all models to ensure they are registered with Base
+from app.models.user import User
+from app.models.task_model import Task
+from app.models.blacklisted_model import BlacklistedToken
+
+
+@asynccontextmanager
+async def sqlite_session():
+    """Fresh file-based SQLite database, set up the same way as tests/conftest.py."""
+    temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+    temp_db.close()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{temp_db.name}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with async_session() as session:
+            yield session
+    finally:
+        await engine.dispose()
+        os.unlink(temp_db.name)
+
+
+@asynccontextmanager
+async def database_session(url: str):
+    """Session on an existing database whose schema is already migrated (``alembic upgrade head``)."""
+    engine = create_async_engine(url, poolclass=NullPool)
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with async_session() as session:
+            yield session
+    finally:
+        await engine.dispose()
+
+
+async def time_async(call, number: int, repeat: int) -> dict:
+    """Median/min seconds per call of an async callable over ``repeat`` rounds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await call()
+        samples.append((time.perf_counter() - start) / number)
+
+    return {"median_s": statistics.median(samples), "min_s": min(samples), "calls": number * repeat}
+
+
+def write_results(path: str, results: dict) -> None:
+    document = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+    with open(path, "w") as fp:
+        json.dump(document, fp, indent=2, sort_keys=True)
+
+
+def compare_results(baseline_path: str, results: dict, threshold: float) -> list[str]:
+    """Names whose median got slower than the baseline by more than ``threshold`` (0.2 = 20%)."""
+    with open(baseline_path) as fp:
+        baseline = json.load(fp)["results"]
+
+    regressions = []
+    for name, current in sorted(results.items()):
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["median_s"], current["median_s"]
+        change = after / before - 1 if before else 0.0
+        marker = "SLOWER" if change > threshold else "ok"
+        print(f"{marker:>6}  {name:<55} {before * 1e6:>12.1f}us -> {after * 1e6:>12.1f}us  ({change:+.1%})")
+        if change > threshold:
+            regressions.append(name)
+
+    return regressions
@@ -0,0 +1,81 @@
+"""Encode/decode throughput of the JWT signing algorithms TokenCodec supports.
+
+    python -m benchmarks.jwt_algorithms
+    python -m benchmarks.jwt_algorithms --algorithms HS256,RS256 --output jwt.json
+
+Also times HS256 with the raw secret handed to python-jose on every call,
+which is how tokens were produced before TokenCodec.
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+
+from jose import jwt
+
+from app.services.token_codec import TokenCodec
+from benchmarks.common import time_async, write_results
+
+
+SECRET = "benchmark-secret-key-0123456789abcdef"
+
+
+def private_key_pem(algorithm: str) -> str:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    if algorithm.startswith(("RS", "PS")):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        curve = {"ES256": ec.SECP256R1(), "ES384": ec.SECP384R1(), "ES512": ec.SECP521R1()}[algorithm]
+        key = ec.generate_private_key(curve)
+    return key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                             serialization.NoEncryption()).decode()
+
+
+def sample_claims() -> dict:
+    now = int(time.time())
+    return {"sub": "bench@example.com", "jti": uuid.uuid4().hex, "iat": now, "exp": now + 1800, "gen": 0}
+
+
+async def _sync(func, *args):
+    return func(*args)
+
+
+async def main(args) -> int:
+    results = {}
+    claims = sample_claims()
+
+    raw_token = jwt.encode(claims, SECRET, algorithm="HS256")
+    results["HS256-raw-key.encode"] = await time_async(lambda: _sync(jwt.encode, claims, SECRET, "HS256"), args.number, 5)
+    results["HS256-raw-key.decode"] = await time_async(lambda: _sync(jwt.decode, raw_token, SECRET, ["HS256"]), args.number, 5)
+
+    for algorithm in args.algorithms:
+        key = SECRET if algorithm.startswith("HS") else private_key_pem(algorithm)
+        codec = TokenCodec(algorithm=algorithm, signing_key=key, active_kid="bench")
+        token = codec.encode(claims)
+        results[f"{algorithm}.encode"] = await time_async(lambda: _sync(codec.encode, claims), args.number, 5)
+        results[f"{algorithm}.decode"] = await time_async(lambda: _sync(codec.decode, token), args.number, 5)
+
+    print(f"{'benchmark':<24} {'us/op':>10} {'ops/s':>10}")
+    for name, result in results.items():
+        print(f"{name:<24} {result['median_s'] * 1e6:>10.1f} {1 / result['median_s']:>10.0f}")
+
+    if args.output:
+        write_results(args.output, results)
+
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--algorithms", type=lambda v: v.split(","), default=["HS256", "HS512", "RS256", "ES256"],
+                        help="comma separated algorithms (default: HS256,HS512,RS256,ES256)")
+    parser.add_argument("--number", type=int, default=500, help="calls per timing round (default: 500)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
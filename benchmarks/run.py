@@ -0,0 +1,157 @@
+"""Micro-benchmarks for the request hot path.
+
+Record a baseline, then compare a later run against it:
+
+    python -m benchmarks.run --output benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.2
+
+Repository benchmarks run against a temporary SQLite database seeded with
+each of ``--sizes`` tasks for the benchmarked user.
+"""
+import argparse
+import asyncio
+import itertools
+import sys
+import uuid
+
+from sqlalchemy import insert
+
+from app.models.user import User
+from app.models.task_model import Task
+from app.schemas.tasks_schema import TaskCreate, TaskListSpec, TaskResponse, TaskUpdate, task_list_adapter
+from app.schemas.user_schema import UserBase, UserCreate
+from app.services.auth import create_token_pair, decode_access_token
+from app.services.hash import get_password_hash, verify_password
+from app.repository import task as task_repository
+from app.repository import user as user_repository
+
+from benchmarks.common import sqlite_session, time_async, write_results, compare_results
+
+
+PASSWORD = "benchmark-password"
+PASSWORD_HASH = get_password_hash(PASSWORD)
+
+
+async def seed_user(db, email: str) -> User:
+    user = User(id=uuid.uuid4(), username=email, email=email, first_name="Bench",
+                age=30, password=PASSWORD_HASH, is_active=True)
+    db.add(user)
+    await db.commit()
+    return user
+
+
+async def seed_tasks(db, user: User, count: int) -> None:
+    rows = [{"id": uuid.uuid4(), "title": f"Task {i}", "description": f"Description {i}", "user_id": user.id}
+            for i in range(count)]
+    for start in range(0, count, 5000):
+        await db.execute(insert(Task), rows[start:start + 5000])
+    await db.commit()
+
+
+async def run_static(results: dict, only: str | None) -> None:
+    user = UserBase(email="bench@example.com", first_name="Bench")
+    token = create_token_pair(user=user).access.token
+
+    async with sqlite_session() as db:
+        cases = {
+            "create_token_pair": (lambda: _sync(create_token_pair, user), 2000, 5),
+            "decode_access_token": (lambda: decode_access_token(token=token, db=db), 2000, 5),
+            "get_password_hash": (lambda: _sync(get_password_hash, PASSWORD), 3, 3),
+            "verify_password": (lambda: _sync(verify_password, PASSWORD, PASSWORD_HASH), 3, 3),
+        }
+        await _run_cases(results, cases, only)
+
+
+async def run_sized(results: dict, size: int, only: str | None) -> None:
+    async with sqlite_session() as db:
+        user = await seed_user(db, "bench@example.com")
+        await seed_tasks(db, user, size)
+        other = await seed_user(db, "delete@example.com")
+        await seed_tasks(db, other, 200)
+
+        tasks = await task_repository.get_tasks(user=user, db=db)
+        task_id = tasks[0].id
+        delete_ids = iter([t.id for t in await task_repository.get_tasks(user=other, db=db)])
+        emails = (f"new{i}@example.com" for i in itertools.count())
+
+        class LoginForm:
+            username = user.email
+            password = PASSWORD
+
+        async def create_user():
+            email = next(emails)
+            body = UserCreate(username=email, email=email, first_name="New", last_name="User", age=30,
+                              password=PASSWORD, password_confirm=PASSWORD)
+            await user_repository.create_user(body=body, db=db)
+
+        async def drain_stream():
+            async for _ in task_repository.stream_all_tasks_and_their_user(db=db):
+                pass
+
+        many = 20 if size <= 1000 else 3
+        cases = {
+            # writes go to the second user so reads keep seeing exactly ``size`` tasks
+            "create_new_task": (lambda: task_repository.create_new_task(user=other, body=TaskCreate(title="t", description="d"), db=db), 100, 3),
+            "create_new_tasks_x100": (lambda: task_repository.create_new_tasks(user=other, bodies=[TaskCreate(title="t", description="d")] * 100, db=db), 10, 3),
+            "get_tasks": (lambda: task_repository.get_tasks(user=user, db=db), many, 3),
+            "get_tasks_page": (lambda: task_repository.get_tasks_page(user=user, db=db), 200, 3),
+            "get_tasks_page_filtered": (lambda: task_repository.get_tasks_page(user=user, db=db, spec=TaskListSpec(title_prefix="Task 1", sort="title", order="desc")), 200, 3),
+            "get_task_by_id": (lambda: task_repository.get_task_by_id(user=user, task_id=task_id, db=db), 200, 3),
+            "get_all_tasks_and_their_user": (lambda: task_repository.get_all_tasks_and_their_user(db=db), many, 3),
+            "stream_all_tasks_and_their_user": (drain_stream, many, 3),
+            "update_task": (lambda: task_repository.update_task(user=user, body=TaskUpdate(title="u", description="u"), task_id=task_id, db=db), 100, 3),
+            "update_task_orm_mode": (lambda: task_repository.update_task_orm_mode(user=user, body=TaskUpdate(title="o", description="o"), task_id=task_id, db=db), 100, 3),
+            "delete_task": (lambda: task_repository.delete_task(user=other, task_id=next(delete_ids), db=db), 50, 3),
+            "create_user": (create_user, 3, 3),
+            "create_token_for_user": (lambda: user_repository.create_token_for_user(body=LoginForm(), db=db), 3, 3),
+            "serialize_task_responses": (lambda: _sync(lambda: [TaskResponse.model_validate(t, from_attributes=True).model_dump(mode="json") for t in tasks]), many, 3),
+            "serialize_task_responses_batch": (lambda: _sync(lambda: task_list_adapter.dump_json(task_list_adapter.validate_python(tasks, from_attributes=True))), many, 3),
+        }
+        await _run_cases(results, cases, only, suffix=f"[{size}]")
+
+
+async def _sync(func, *args):
+    return func(*args)
+
+
+async def _run_cases(results: dict, cases: dict, only: str | None, suffix: str = "") -> None:
+    for name, (call, number, repeat) in cases.items():
+        key = f"{name}{suffix}"
+        if only and only not in key:
+            continue
+        results[key] = await time_async(call, number=number, repeat=repeat)
+        print(f"{key:<55} {results[key]['median_s'] * 1e6:>12.1f}us", file=sys.stderr)
+
+
+async def main(args) -> int:
+    results = {}
+    await run_static(results, args.only)
+    for size in args.sizes:
+        await run_sized(results, size, args.only)
+
+    if args.output:
+        write_results(args.output, results)
+
+    if args.compare:
+        regressions = compare_results(args.compare, results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+            return 1
+
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda v: [int(n) for n in v.split(",")], default=[100, 1000, 10000],
+                        help="comma separated numbers of seeded tasks (default: 100,1000,10000)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown before a benchmark is flagged (default: 0.2 = 20%%)")
+    parser.add_argument("--only", help="run only benchmarks whose name contains this text")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -5,16 +5,23 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 from sqlalchemy.pool import NullPool
 from httpx import AsyncClient, ASGITransport
 import uuid
+from contextlib import contextmanager
 
 from app.main import app
 from app.database.base_class import Base
 from app.database.connections import get_db
+from app.database.query_counter import track_queries
 
 # Import all models to ensure they are registered with Base
 from app.models.user import User
 from app.models.task_model import Task
 from app.models.blacklisted_model import BlacklistedToken
 from app.services.hash import get_password_hash
+from app.services.revocation import revocation_cache
+from app.services.principal_cache import principal_cache
+from app.services.throttle import login_throttle
+from app.database.replicas import replica_router
+from app.middleware.drain import in_flight
 
 
 # Use SQLite for testing
@@ -29,6 +36,17 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_in_process_caches():
+    """Drop in-process caches so state never leaks between per-test databases."""
+    revocation_cache.reset()
+    principal_cache.reset()
+    login_throttle.reset()
+    replica_router.reset()
+    in_flight.reset()
+    yield
+
+
 @pytest.fixture(scope="function")
 async def test_db():
     """Create a fresh database for each test."""
@@ -151,3 +169,20 @@ async def test_task(test_db, test_user):
     await test_db.commit()
     await test_db.refresh(task)
     return task
+
+
+@pytest.fixture
+def query_budget():
+    """Assert that the wrapped block runs at most ``max_queries`` SQL statements.
+
+        with query_budget(2):
+            await client.get(...)
+    """
+    @contextmanager
+    def budget(max_queries: int):
+        with track_queries(record_statements=True) as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"{stats.count} queries, budget {max_queries}:\n" + "\n".join(stats.statements)
+        )
+    return budget
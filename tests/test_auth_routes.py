@@ -155,6 +155,41 @@ class TestAuthRoutes:
         )
         assert response2.status_code == 401
     
+    @pytest.mark.asyncio
+    async def test_logout_all_revokes_every_token(self, client: AsyncClient, test_user):
+        """Test that logout_all rejects all previously issued tokens."""
+        tokens = []
+        for _ in range(2):
+            response = await client.post(
+                "/auth/login",
+                data={"username": test_user.email, "password": "testpassword123"}
+            )
+            tokens.append(response.json()["access_token"])
+        
+        response = await client.post(
+            "/auth/logout_all",
+            headers={"Authorization": f"Bearer {tokens[0]}"}
+        )
+        assert response.status_code == 200
+        
+        for token in tokens:
+            response = await client.get(
+                "/auth/protected_data",
+                headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 401
+        
+        # A fresh login is issued under the new generation
+        response = await client.post(
+            "/auth/login",
+            data={"username": test_user.email, "password": "testpassword123"}
+        )
+        response = await client.get(
+            "/auth/protected_data",
+            headers={"Authorization": f"Bearer {response.json()['access_token']}"}
+        )
+        assert response.status_code == 200
+    
     @pytest.mark.asyncio
     async def test_protected_data_success(self, client: AsyncClient, auth_token: str, test_user):
         """Test accessing protected data with valid token."""
@@ -9,7 +9,7 @@ from app.services.auth import (
     refresh_token_state,
     authenticate,
     get_token_of_auth_user,
-    SUB, EXP, JTI, IAT
+    SUB, EXP, JTI, IAT, GEN
 )
 from app.schemas.user_schema import UserBase
 from app.models.user import User
@@ -64,6 +64,14 @@ class TestAuthService:
         assert token_pair.access.token is not None
         assert token_pair.refresh.token is not None
     
+    def test_create_token_pair_embeds_generation(self):
+        """Test that the user's token generation is part of the claims."""
+        user = UserBase(email="test@example.com", first_name="Test")
+        token_pair = create_token_pair(user, generation=3)
+        
+        assert token_pair.access.payload[GEN] == 3
+        assert token_pair.refresh.payload[GEN] == 3
+    
     @pytest.mark.asyncio
     async def test_decode_access_token(self, test_db):
         """Test decoding a valid access token."""
@@ -1,8 +1,21 @@
 import pytest
+import uuid
+from sqlalchemy import event
 from app.database.base_class import Base
+from app.models.task_model import Task
 from fastapi import HTTPException
 
 
+def record_statements(db):
+    statements = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+    return statements
+
+
 class TestBaseClass:
     """Test Base class functionality."""
     
@@ -11,3 +24,39 @@ class TestBaseClass:
         """Test that save method works (covered by other tests)."""
         # This is already covered by model tests
         assert test_user.id is not None
+    
+    @pytest.mark.asyncio
+    async def test_save_returns_generated_columns_without_refresh(self, test_db, test_user):
+        """Test that save fetches timestamps in the INSERT itself."""
+        statements = record_statements(test_db)
+        task = Task(title="Saved", description="d", user_id=test_user.id)
+        
+        await task.save(db=test_db)
+        
+        assert task.created_at is not None
+        assert task.updated_at is not None
+        assert len(statements) == 1
+        assert statements[0].startswith("INSERT")
+    
+    @pytest.mark.asyncio
+    async def test_save_many(self, test_db, test_user):
+        """Test persisting several instances in one flush."""
+        statements = record_statements(test_db)
+        tasks = [Task(title=f"Task {i}", description="d", user_id=test_user.id) for i in range(3)]
+        
+        saved = await Task.save_many(db=test_db, instances=tasks)
+        
+        assert saved == tasks
+        assert all(task.created_at is not None for task in tasks)
+        assert len(statements) == 1
+    
+    @pytest.mark.asyncio
+    async def test_save_many_error(self, test_db, test_user):
+        """Test that database errors surface as 422."""
+        task_id = uuid.uuid4()
+        tasks = [Task(id=task_id, title=f"Task {i}", description="d", user_id=test_user.id) for i in range(2)]
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await Task.save_many(db=test_db, instances=tasks)
+        
+        assert exc_info.value.status_code == 422
@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from app.models.blacklisted_model import BlacklistedToken
+from app.services import blacklist_sweeper
+from app.services.blacklist_sweeper import purge_expired_tokens, run_blacklist_sweeper
+
+
+class TestBlacklistSweeper:
+    """Test purging of expired blacklisted tokens."""
+    
+    @pytest.mark.asyncio
+    async def test_purge_deletes_only_expired(self, test_db):
+        """Test that live blacklist entries survive a purge."""
+        now = datetime.now(timezone.utc)
+        for i in range(5):
+            test_db.add(BlacklistedToken(id=f"expired-{i}", expire=now - timedelta(hours=1)))
+        test_db.add(BlacklistedToken(id="live", expire=now + timedelta(hours=1)))
+        await test_db.commit()
+        
+        deleted = await purge_expired_tokens(db=test_db, batch_size=2)
+        
+        assert deleted == 5
+        result = await test_db.execute(select(BlacklistedToken.id))
+        assert result.scalars().all() == ["live"]
+    
+    @pytest.mark.asyncio
+    async def test_purge_empty_table(self, test_db):
+        """Test purging when nothing has expired."""
+        deleted = await purge_expired_tokens(db=test_db, batch_size=10)
+        
+        assert deleted == 0
+
+    @pytest.mark.asyncio
+    async def test_sweeper_survives_non_database_errors(self, monkeypatch):
+        """Test that an error the driver raises outside SQLAlchemy does not end the sweeper."""
+        calls = []
+
+        async def flaky_purge(db, batch_size):
+            calls.append(batch_size)
+            if len(calls) == 1:
+                raise OSError("connection reset")
+            return 0
+
+        monkeypatch.setattr(blacklist_sweeper, "purge_expired_tokens", flaky_purge)
+        sweeper = asyncio.create_task(run_blacklist_sweeper(interval=0, batch_size=10))
+        await asyncio.sleep(0.05)
+
+        assert not sweeper.done()
+        assert len(calls) > 1
+        sweeper.cancel()
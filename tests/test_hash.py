@@ -1,5 +1,12 @@
+import asyncio
 import pytest
-from app.services.hash import get_password_hash, verify_password
+from app.services.hash import (
+    get_password_hash,
+    verify_password,
+    get_password_hash_async,
+    verify_password_async,
+    HashExecutor,
+)
 
 
 class TestHashService:
@@ -50,3 +57,28 @@ class TestHashService:
         hashed = get_password_hash("")
         assert hashed is not None
         assert len(hashed) > 0
+    
+    @pytest.mark.asyncio
+    async def test_async_hash_and_verify(self):
+        """Test the executor-backed hashing helpers."""
+        hashed = await get_password_hash_async("testpassword123")
+        
+        assert await verify_password_async("testpassword123", hashed) is True
+        assert await verify_password_async("wrongpassword", hashed) is False
+    
+    @pytest.mark.asyncio
+    async def test_executor_concurrency_cap(self):
+        """Test that calls over the cap queue up and are counted."""
+        executor = HashExecutor(kind="thread", workers=2, max_concurrency=1)
+        hashed = get_password_hash("testpassword123")
+        
+        results = await asyncio.gather(*[
+            executor.run(verify_password, "testpassword123", hashed) for _ in range(3)
+        ])
+        executor.shutdown()
+        
+        assert results == [True, True, True]
+        assert executor.stats["completed"] == 3
+        assert executor.stats["max_waiting"] == 2
+        assert executor.stats["waiting"] == 0
+        assert executor.stats["running"] == 0
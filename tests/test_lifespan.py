@@ -0,0 +1,260 @@
+import asyncio
+import signal
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.middleware.drain import DrainMiddleware, InFlightRequests, drain_on_signal, in_flight
+from app.services import warmup
+from app.services.warmup import open_connections, prime_statements, warm_up
+
+
+class TestDraining:
+    """Test that shutdown waits for running requests."""
+    
+    @pytest.fixture
+    def slow_app(self):
+        release = asyncio.Event()
+        
+        async def app(scope, receive, send):
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"done"})
+        
+        return app, release
+    
+    @staticmethod
+    async def call(app, path: str = "/") -> list[dict]:
+        messages = []
+        
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+        
+        async def send(message):
+            messages.append(message)
+        
+        await app({"type": "http", "method": "GET", "path": path, "headers": []}, receive, send)
+        return messages
+    
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_in_flight_request(self, slow_app):
+        """Test that draining finishes only after the running request does."""
+        app, release = slow_app
+        tracker = InFlightRequests()
+        middleware = DrainMiddleware(app, tracker)
+        
+        running = asyncio.create_task(self.call(middleware))
+        await asyncio.sleep(0.01)
+        assert tracker.count == 1
+        
+        drain = asyncio.create_task(tracker.drain(timeout=5))
+        await asyncio.sleep(0.01)
+        assert tracker.draining and not drain.done()
+        
+        release.set()
+        assert (await running)[0]["status"] == 200
+        assert await drain is True
+        assert tracker.count == 0
+    
+    @pytest.mark.asyncio
+    async def test_only_readiness_fails_while_draining(self, slow_app):
+        """Test that draining fails the probe but keeps serving requests, asking clients to reconnect."""
+        app, release = slow_app
+        release.set()
+        tracker = InFlightRequests()
+        tracker.draining = True
+        middleware = DrainMiddleware(app, tracker)
+        
+        probe = await self.call(middleware, path="/ready")
+        served = await self.call(middleware, path="/Tasks/tasks")
+        
+        assert probe[0]["status"] == 503
+        assert served[0]["status"] == 200
+        assert (b"connection", b"close") in served[0]["headers"]
+    
+    @pytest.mark.asyncio
+    async def test_drain_timeout(self, slow_app):
+        """Test that draining gives up after the timeout."""
+        app, release = slow_app
+        tracker = InFlightRequests()
+        running = asyncio.create_task(self.call(DrainMiddleware(app, tracker)))
+        await asyncio.sleep(0.01)
+        
+        assert await tracker.drain(timeout=0.01) is False
+        
+        release.set()
+        await running
+
+
+class TestWarmUp:
+    """Test startup warm-up."""
+    
+    @pytest.mark.asyncio
+    async def test_connections_are_pooled(self, test_db):
+        """Test that warm-up leaves the requested number of idle connections in the pool."""
+        engine = create_async_engine(test_db.bind.url, poolclass=AsyncAdaptedQueuePool, pool_size=3)
+        try:
+            await open_connections(engine, 3)
+            assert engine.pool.checkedin() == 3
+        finally:
+            await engine.dispose()
+    
+    @pytest.mark.asyncio
+    async def test_connections_beyond_pool_size_are_not_opened(self, test_db):
+        """Test that warm-up stops at the pool size, since overflow connections are closed on checkin."""
+        engine = create_async_engine(test_db.bind.url, poolclass=AsyncAdaptedQueuePool, pool_size=2, max_overflow=5)
+        try:
+            await open_connections(engine, 5)
+            assert engine.pool.checkedin() == 2
+        finally:
+            await engine.dispose()
+    
+    @pytest.mark.asyncio
+    async def test_failed_connect_releases_the_others(self, test_db):
+        """Test that one failing connect does not leave the other warm-up connections checked out."""
+        engine = create_async_engine(test_db.bind.url, poolclass=AsyncAdaptedQueuePool, pool_size=3)
+        connects = []
+        
+        @event.listens_for(engine.sync_engine, "do_connect")
+        def third_connect_fails(dialect, conn_rec, cargs, cparams):
+            connects.append(conn_rec)
+            if len(connects) == 3:
+                raise OSError("connection refused")
+        
+        try:
+            with pytest.raises(Exception):
+                await open_connections(engine, 3)
+            assert engine.pool.checkedout() == 0
+        finally:
+            await engine.dispose()
+    
+    @pytest.mark.asyncio
+    async def test_hot_statements_are_compiled(self, test_db):
+        """Test that priming fills the engine's compiled statement cache."""
+        cache = test_db.bind.sync_engine._compiled_cache
+        cache.clear()
+        
+        await prime_statements(test_db)
+        
+        assert len(cache) >= 5
+    
+    @pytest.mark.asyncio
+    async def test_unreachable_database_does_not_fail_startup(self, caplog):
+        """Test that a failed warm-up is logged and skipped."""
+        engine = create_async_engine("sqlite+aiosqlite:////nonexistent/dir/db.sqlite")
+        
+        await warm_up(engines=[engine], connections=1)
+        
+        assert "Could not warm up" in caplog.text
+        await engine.dispose()
+    
+    @pytest.mark.asyncio
+    async def test_crypto_failure_does_not_fail_startup(self, caplog, monkeypatch):
+        """Test that a failing hash or token warm-up is logged and skipped."""
+        async def broken():
+            raise RuntimeError("no hash workers")
+        monkeypatch.setattr(warmup, "warm_up_crypto", broken)
+        
+        await warm_up(engines=[], connections=1)
+        
+        assert "Could not warm up hashing and tokens" in caplog.text
+
+
+class TestDrainOnSignal:
+    """Test that draining starts when the shutdown signal arrives, before the server sees it."""
+    
+    @pytest.fixture
+    def server_handler(self):
+        received = []
+        original = signal.signal(signal.SIGTERM, lambda signum, frame: received.append(signum))
+        yield received
+        signal.signal(signal.SIGTERM, original)
+    
+    @pytest.mark.asyncio
+    async def test_signal_is_passed_on_once_idle(self, server_handler):
+        """Test that the server's handler runs only after the last request finished."""
+        tracker = InFlightRequests()
+        restore = drain_on_signal(tracker, timeout=5)
+        tracker.started()
+        
+        signal.raise_signal(signal.SIGTERM)
+        await asyncio.sleep(0.01)
+        assert tracker.draining and server_handler == []
+        
+        tracker.finished()
+        await asyncio.sleep(0.01)
+        assert server_handler == [signal.SIGTERM]
+        restore()
+    
+    @pytest.mark.asyncio
+    async def test_signal_waits_for_prestop_delay_when_idle(self, server_handler):
+        """Test that an idle worker still gives the load balancer the pre-stop delay to notice."""
+        tracker = InFlightRequests()
+        restore = drain_on_signal(tracker, timeout=5, prestop_delay=0.1)
+        
+        signal.raise_signal(signal.SIGTERM)
+        await asyncio.sleep(0.05)
+        assert tracker.draining and server_handler == []
+        
+        await asyncio.sleep(0.1)
+        assert server_handler == [signal.SIGTERM]
+        restore()
+    
+    @pytest.mark.asyncio
+    async def test_signal_is_passed_on_after_timeout(self, server_handler):
+        """Test that a request that never finishes does not hold up shutdown beyond the timeout."""
+        tracker = InFlightRequests()
+        restore = drain_on_signal(tracker, timeout=0.01)
+        tracker.started()
+        
+        signal.raise_signal(signal.SIGTERM)
+        await asyncio.sleep(0.05)
+        
+        assert server_handler == [signal.SIGTERM]
+        restore()
+    
+    @pytest.mark.asyncio
+    async def test_second_signal_skips_the_wait(self, server_handler):
+        """Test that signalling again while draining shuts down at once, and only once."""
+        tracker = InFlightRequests()
+        restore = drain_on_signal(tracker, timeout=5)
+        tracker.started()
+        
+        signal.raise_signal(signal.SIGTERM)
+        await asyncio.sleep(0.01)
+        signal.raise_signal(signal.SIGTERM)
+        tracker.finished()
+        await asyncio.sleep(0.01)
+        
+        assert server_handler == [signal.SIGTERM]
+        restore()
+    
+    @pytest.mark.asyncio
+    async def test_readiness_flips_while_draining(self, client: AsyncClient):
+        """Test that the readiness endpoint answers 503 once draining has begun, while other routes still work."""
+        ready = await client.get("/ready")
+        in_flight.draining = True
+        draining = await client.get("/ready")
+        served = await client.get("/")
+        
+        assert ready.status_code == 200
+        assert draining.status_code == 503
+        assert served.status_code == 200
+        assert served.headers["connection"] == "close"
+
+
+class TestLifespan:
+    """Test the application lifespan end to end."""
+    
+    @pytest.mark.asyncio
+    async def test_startup_and_shutdown(self):
+        """Test that the app starts, hooks the shutdown signal and hands it back on shutdown."""
+        from app.main import app, lifespan
+        original = signal.getsignal(signal.SIGTERM)
+        
+        async with lifespan(app):
+            assert signal.getsignal(signal.SIGTERM) is not original
+        
+        assert signal.getsignal(signal.SIGTERM) is original
+        assert not in_flight.draining
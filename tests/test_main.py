@@ -14,3 +14,20 @@ class TestMainApplication:
         data = response.json()
         assert "message" in data
         assert data["message"] == "Hello world"
+    
+    @pytest.mark.asyncio
+    async def test_revocation_stats(self, client: AsyncClient):
+        """Test revocation cache counters endpoint."""
+        response = await client.get("/stats/revocation")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert "bloom_negative" in data
+        assert "db_lookup" in data
+    
+    def test_default_response_class_is_orjson(self):
+        """Test that responses are rendered with orjson by default."""
+        from fastapi.responses import ORJSONResponse
+        from app.main import app
+        
+        assert app.router.default_response_class is ORJSONResponse
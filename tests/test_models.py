@@ -1,7 +1,7 @@
 import pytest
 import uuid
 from app.models.user import User
-from app.models.task_model import Task
+from app.models.task_model import Task, include_in_autogenerate
 from app.models.blacklisted_model import BlacklistedToken
 from app.services.hash import get_password_hash
 from datetime import datetime, timezone
@@ -168,3 +168,24 @@ class TestBlacklistedTokenModel:
         found_token = await BlacklistedToken.find_by_id(db=test_db, id="nonexistent")
         
         assert found_token is None
+
+
+class TestMigrationAutogenerate:
+    """Test the autogenerate filter for objects created only by migrations."""
+    
+    @pytest.mark.parametrize("name, type_", [
+        ("search_vector", "column"),
+        ("ix_task_search_vector", "index"),
+        ("fts_rowid", "column"),
+        ("ix_task_fts_rowid", "index"),
+        ("task_fts", "table"),
+        ("task_fts_data", "table"),
+    ])
+    def test_search_objects_are_not_dropped(self, name, type_):
+        """Test that reflected search objects without a mapping are left out of the comparison."""
+        assert not include_in_autogenerate(None, name, type_, reflected=True, compare_to=None)
+    
+    def test_other_unmapped_objects_are_compared(self):
+        """Test that anything else missing from the models is still reported."""
+        assert include_in_autogenerate(None, "legacy", "table", reflected=True, compare_to=None)
+        assert include_in_autogenerate(None, "ix_task_title", "index", reflected=True, compare_to=None)
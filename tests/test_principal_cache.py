@@ -0,0 +1,73 @@
+import pytest
+import uuid
+from httpx import AsyncClient
+from app.services.principal_cache import Principal, PrincipalCache, principal_cache
+
+
+def make_principal(email="a@example.com"):
+    return Principal(id=uuid.uuid4(), email=email, is_active=True, token_generation=0)
+
+
+class TestPrincipalCache:
+    """Test the authenticated principal cache."""
+    
+    def test_put_and_get(self):
+        """Test that a stored principal is returned."""
+        cache = PrincipalCache(max_size=10, ttl=60)
+        principal = make_principal()
+        cache.put(principal.email, principal)
+        
+        assert cache.get(principal.email) == principal
+        assert cache.stats["hits"] == 1
+    
+    def test_expired_entry_is_a_miss(self):
+        """Test that entries past their TTL are not returned."""
+        cache = PrincipalCache(max_size=10, ttl=0)
+        principal = make_principal()
+        cache.put(principal.email, principal)
+        
+        assert cache.get(principal.email) is None
+        assert cache.stats["misses"] == 1
+    
+    def test_least_recently_used_is_evicted(self):
+        """Test that the cache stays within its bound."""
+        cache = PrincipalCache(max_size=2, ttl=60)
+        for email in ["a@example.com", "b@example.com"]:
+            cache.put(email, make_principal(email))
+        cache.get("a@example.com")
+        cache.put("c@example.com", make_principal("c@example.com"))
+        
+        assert cache.get("b@example.com") is None
+        assert cache.get("a@example.com") is not None
+    
+    @pytest.mark.asyncio
+    async def test_user_update_invalidates(self, test_db, test_user):
+        """Test that changing the user row drops its cached principal."""
+        principal_cache.put(test_user.email, Principal.from_user(test_user))
+        
+        test_user.is_active = False
+        await test_db.commit()
+        
+        assert principal_cache.get(test_user.email) is None
+    
+    @pytest.mark.asyncio
+    async def test_repeated_requests_use_cache(self, client: AsyncClient, auth_token: str):
+        """Test that only the first authenticated request loads the user."""
+        for _ in range(3):
+            response = await client.get(
+                "/auth/protected_data",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+            assert response.status_code == 200
+        
+        assert principal_cache.stats["misses"] == 1
+        assert principal_cache.stats["hits"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_logout_invalidates(self, client: AsyncClient, auth_token: str, test_user):
+        """Test that logging out drops the cached principal."""
+        await client.get("/auth/protected_data", headers={"Authorization": f"Bearer {auth_token}"})
+        
+        await client.post("/auth/logout", headers={"Authorization": f"Bearer {auth_token}"})
+        
+        assert principal_cache.get(test_user.email) is None
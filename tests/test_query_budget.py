@@ -0,0 +1,161 @@
+import pytest
+from httpx import AsyncClient
+from app.database.query_counter import track_queries
+
+
+class TestQueryCounter:
+    """Test per-request SQL statement counting."""
+    
+    @pytest.mark.asyncio
+    async def test_nested_scopes_both_count(self, test_db, test_user):
+        """Test that a statement counts towards every enclosing scope."""
+        from app.models.user import User
+        
+        with track_queries() as outer:
+            await User.find_by_email(db=test_db, email=test_user.email)
+            with track_queries() as inner:
+                await User.find_by_email(db=test_db, email=test_user.email)
+        
+        assert (outer.count, inner.count) == (2, 1)
+        assert outer.duration >= inner.duration > 0
+    
+    @pytest.mark.asyncio
+    async def test_response_headers(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that the statement count and database time are returned."""
+        response = await client.get(
+            "/Tasks/tasks",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert int(response.headers["x-db-queries"]) >= 1
+        assert float(response.headers["x-db-time-ms"]) > 0
+
+
+class TestRouteQueryBudgets:
+    """Keep the number of statements per route from creeping up."""
+    
+    @pytest.fixture
+    async def headers(self, client: AsyncClient, auth_token: str):
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        # the first authenticated request loads the revocation filter and the principal
+        await client.get("/auth/protected_data", headers=headers)
+        return headers
+    
+    @pytest.mark.asyncio
+    async def test_first_authenticated_request(self, client: AsyncClient, auth_token: str, test_task, query_budget):
+        """Revocation filter load, user load, tasks version and the task query."""
+        with query_budget(4):
+            response = await client.get("/Tasks/tasks", headers={"Authorization": f"Bearer {auth_token}"})
+        assert response.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_list_tasks(self, client: AsyncClient, headers, test_task, query_budget):
+        """Tasks version for the ETag and the task query."""
+        with query_budget(2):
+            response = await client.get("/Tasks/tasks", headers=headers)
+        assert response.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_get_task(self, client: AsyncClient, headers, test_task, query_budget):
+        with query_budget(1):
+            response = await client.get(f"/Tasks/task/{test_task.id}", headers=headers)
+        assert response.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_get_task_not_modified(self, client: AsyncClient, headers, test_task, query_budget):
+        """Only the version lookup; the row is not loaded."""
+        etag = (await client.get(f"/Tasks/task/{test_task.id}", headers=headers)).headers["etag"]
+        with query_budget(1):
+            response = await client.get(f"/Tasks/task/{test_task.id}", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+    
+    @pytest.mark.asyncio
+    async def test_create_task(self, client: AsyncClient, headers, query_budget):
+        """The INSERT and the tasks version bump."""
+        with query_budget(2):
+            response = await client.post("/Tasks/task_create", json={"title": "a", "description": "b"}, headers=headers)
+        assert response.status_code == 201
+    
+    @pytest.mark.asyncio
+    async def test_bulk_create_tasks(self, client: AsyncClient, headers, query_budget):
+        with query_budget(2):
+            response = await client.post(
+                "/Tasks/tasks_bulk_create",
+                json=[{"title": f"t{i}", "description": "b"} for i in range(20)],
+                headers=headers
+            )
+        assert response.status_code == 201
+    
+    @pytest.mark.asyncio
+    async def test_update_task(self, client: AsyncClient, headers, test_task, query_budget):
+        with query_budget(2):
+            response = await client.patch(
+                f"/Tasks/update_task/{test_task.id}",
+                json={"title": "x", "description": "y"},
+                headers=headers
+            )
+        assert response.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_conditional_update_task(self, client: AsyncClient, headers, test_task, query_budget):
+        """The version check happens inside the UPDATE, so If-Match costs no extra statement."""
+        etag = (await client.get(f"/Tasks/task/{test_task.id}", headers=headers)).headers["etag"]
+        with query_budget(2):
+            response = await client.patch(
+                f"/Tasks/update_task/{test_task.id}",
+                json={"title": "x"},
+                headers={**headers, "If-Match": etag}
+            )
+        assert response.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_delete_task(self, client: AsyncClient, headers, test_task, query_budget):
+        with query_budget(2):
+            response = await client.delete(f"/Tasks/delete_task{test_task.id}", headers=headers)
+        assert response.status_code == 204
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_tasks(self, client: AsyncClient, headers, test_task, query_budget):
+        """One CASE-based UPDATE ... RETURNING for the whole batch and the tasks version bump."""
+        with query_budget(2):
+            response = await client.patch(
+                "/Tasks/tasks_bulk_update",
+                json=[{"id": str(test_task.id), "title": "x"}],
+                headers=headers
+            )
+        assert response.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_bulk_delete_tasks(self, client: AsyncClient, headers, test_task, query_budget):
+        with query_budget(2):
+            response = await client.post("/Tasks/tasks_bulk_delete", json={"ids": [str(test_task.id)]}, headers=headers)
+        assert response.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_not_modified(self, client: AsyncClient, headers, test_task, query_budget):
+        """A matching ETag needs only the tasks version."""
+        etag = (await client.get("/Tasks/tasks", headers=headers)).headers["etag"]
+        with query_budget(1):
+            response = await client.get("/Tasks/tasks", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+    
+    @pytest.mark.asyncio
+    async def test_register(self, client: AsyncClient, query_budget):
+        """One uniqueness check and the INSERT ... RETURNING."""
+        with query_budget(2):
+            response = await client.post("/auth/register", json={
+                "email": "new@example.com",
+                "first_name": "New",
+                "last_name": "User",
+                "username": "newuser",
+                "age": 30,
+                "password": "password123",
+                "password_confirm": "password123"
+            })
+        assert response.status_code == 201
+    
+    @pytest.mark.asyncio
+    async def test_login(self, client: AsyncClient, test_user, query_budget):
+        with query_budget(1):
+            response = await client.post("/auth/login", data={"username": test_user.email, "password": "testpassword123"})
+        assert response.status_code == 200
@@ -0,0 +1,126 @@
+import re
+import uuid
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import event, select
+from app.models.task_model import Task
+from app.models.user import User
+from app.models.blacklisted_model import BlacklistedToken
+from app.repository import task as task_repository
+from app.schemas.tasks_schema import TaskCreate, TaskUpdate, TaskListSpec, TaskBatchUpdateItem
+from app.services.blacklist_sweeper import purge_expired_tokens
+
+
+# Repository queries that read the whole table on purpose
+FULL_SCAN_ALLOWED = {"get_all_tasks_and_their_user", "stream_all_tasks_and_their_user"}
+
+FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)")
+
+
+async def capture_plans(db, call) -> list[tuple[str, list[str]]]:
+    """Run ``call`` and return the EXPLAIN QUERY PLAN of every SELECT/UPDATE/DELETE it issued."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().split()[0].upper() in ("SELECT", "UPDATE", "DELETE"):
+            statements.append((statement, parameters))
+    
+    engine = db.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await call()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    
+    plans = []
+    conn = await db.connection()
+    for statement, parameters in statements:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        plans.append((statement, [row[3] for row in result]))
+    return plans
+
+
+def full_scans(plans) -> list[str]:
+    return [f"{detail} <- {statement}" for statement, details in plans for detail in details if FULL_SCAN.match(detail)]
+
+
+async def drain_stream(rows):
+    async for _ in rows:
+        pass
+
+
+@pytest.fixture
+async def seeded(test_db, test_user, test_user2):
+    for owner in (test_user, test_user2):
+        for i in range(20):
+            test_db.add(Task(id=uuid.uuid4(), title=f"Task {i}", description="d", user_id=owner.id))
+    test_db.add(BlacklistedToken(id="old", expire=datetime(2000, 1, 1, tzinfo=timezone.utc)))
+    await test_db.commit()
+    result = await test_db.execute(select(Task.id).where(Task.user_id == test_user.id).limit(2))
+    return result.scalars().all()
+
+
+class TestQueryPlans:
+    """Guard against repository queries falling back to full table scans."""
+    
+    @pytest.mark.asyncio
+    async def test_harness_detects_full_scan(self, test_db, seeded):
+        """Test that an unindexed filter is reported."""
+        plans = await capture_plans(
+            test_db,
+            lambda: test_db.execute(select(Task).where(Task.description == "d"))
+        )
+        
+        assert full_scans(plans)
+    
+    @pytest.mark.asyncio
+    async def test_repository_queries_use_indexes(self, test_db, test_user, seeded):
+        """Test that every user-scoped repository query is an index search."""
+        task_id, other_id = seeded
+        cases = {
+            "create_new_task": lambda: task_repository.create_new_task(user=test_user, body=TaskCreate(title="t", description="d"), db=test_db),
+            "get_tasks": lambda: task_repository.get_tasks(user=test_user, db=test_db),
+            "get_tasks_page": lambda: task_repository.get_tasks_page(user=test_user, db=test_db, limit=5),
+            "get_task_by_id": lambda: task_repository.get_task_by_id(user=test_user, task_id=task_id, db=test_db),
+            "update_task": lambda: task_repository.update_task(user=test_user, body=TaskUpdate(title="u", description="u"), task_id=task_id, db=test_db),
+            "update_task_orm_mode": lambda: task_repository.update_task_orm_mode(user=test_user, body=TaskUpdate(title="o", description="o"), task_id=task_id, db=test_db),
+            "update_tasks": lambda: task_repository.update_tasks(user=test_user, patches=[TaskBatchUpdateItem(id=task_id, title="b")], db=test_db),
+            "delete_tasks": lambda: task_repository.delete_tasks(user=test_user, task_ids=[uuid.uuid4()], db=test_db),
+            "delete_task": lambda: task_repository.delete_task(user=test_user, task_id=other_id, db=test_db),
+            "find_by_email": lambda: User.find_by_email(db=test_db, email=test_user.email),
+            "find_by_username": lambda: User.find_by_username(db=test_db, username=test_user.username),
+            "blacklist_find_by_id": lambda: BlacklistedToken.find_by_id(db=test_db, id="old"),
+            "purge_expired_tokens": lambda: purge_expired_tokens(db=test_db, batch_size=10),
+            "get_all_tasks_and_their_user": lambda: task_repository.get_all_tasks_and_their_user(db=test_db),
+            "stream_all_tasks_and_their_user": lambda: drain_stream(task_repository.stream_all_tasks_and_their_user(db=test_db)),
+        }
+        
+        failures = {}
+        allowed = {}
+        for name, call in cases.items():
+            scans = full_scans(await capture_plans(test_db, call))
+            if name in FULL_SCAN_ALLOWED:
+                allowed[name] = scans
+            elif scans:
+                failures[name] = scans
+        
+        assert failures == {}
+        # an allowlisted query that stopped scanning no longer needs its exemption
+        assert all(allowed.values()) and allowed.keys() == FULL_SCAN_ALLOWED
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sort", ["created_at", "updated_at", "title"])
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    async def test_sorted_pages_read_in_index_order(self, test_db, test_user, seeded, sort, order):
+        """Test that every sort key is served by its index without a separate sort step."""
+        spec = TaskListSpec(sort=sort, order=order, title_prefix="Task" if sort == "title" else None)
+        _, cursor = await task_repository.get_tasks_page(user=test_user, db=test_db, limit=5, spec=spec)
+        
+        plans = await capture_plans(
+            test_db,
+            lambda: task_repository.get_tasks_page(user=test_user, db=test_db, cursor=cursor, limit=5, spec=spec)
+        )
+        
+        assert full_scans(plans) == []
+        assert not [detail for _, details in plans for detail in details if "TEMP B-TREE" in detail]
+
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import uuid
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.database.base_class import Base
+from app.database.replicas import ReplicaRouter, replica_router
+from app.services.principal_cache import principal_cache
+from app.models.user import User
+from app.models.task_model import Task
+
+
+@pytest.fixture
+async def replica(test_user, monkeypatch):
+    """A second SQLite database standing in for a lagging replica, holding a copy of the test user."""
+    temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+    temp_db.close()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{temp_db.name}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    async with session_maker() as db:
+        columns = {column.key: getattr(test_user, column.key) for column in User.__table__.columns}
+        db.add(User(**columns))
+        db.add(Task(id=uuid.uuid4(), title="Replica Task", description="Only on the replica", user_id=test_user.id))
+        await db.commit()
+    
+    monkeypatch.setattr(replica_router, "session_makers", [session_maker])
+    replica_router.reset()
+    yield session_maker
+    
+    await engine.dispose()
+    os.unlink(temp_db.name)
+
+
+class TestReplicaRouter:
+    """Test the choice between replicas and the primary."""
+    
+    def test_no_replicas_reads_primary(self):
+        """Test that everything stays on the primary when no replica is configured."""
+        router = ReplicaRouter(session_makers=[], sticky_seconds=5)
+        
+        assert router.pick("a@example.com") is None
+        assert router.stats["primary_reads"] == 1
+    
+    def test_round_robin(self):
+        """Test that replicas take turns."""
+        first, second = object(), object()
+        router = ReplicaRouter(session_makers=[first, second], sticky_seconds=5)
+        
+        assert [router.pick(None) for _ in range(3)] == [first, second, first]
+        assert router.stats["replica_reads"] == [2, 1]
+    
+    def test_writer_is_sticky_to_primary(self):
+        """Test that a subject reads from the primary right after writing."""
+        router = ReplicaRouter(session_makers=[object()], sticky_seconds=5)
+        router.mark_write("a@example.com")
+        
+        assert router.pick("a@example.com") is None
+        assert router.pick("b@example.com") is not None
+        assert router.stats["sticky_reads"] == 1
+    
+    def test_stickiness_expires(self):
+        """Test that a subject goes back to replicas once the window has passed."""
+        router = ReplicaRouter(session_makers=[object()], sticky_seconds=0)
+        router.mark_write("a@example.com")
+        
+        assert router.pick("a@example.com") is not None
+    
+    def test_unknown_strategy(self):
+        """Test that a misconfigured strategy fails at startup."""
+        with pytest.raises(ValueError):
+            ReplicaRouter(session_makers=[], sticky_seconds=5, strategy="random")
+
+
+class TestReplicaRouting:
+    """Test read-only routes against a stand-in replica."""
+    
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replica(self, client: AsyncClient, auth_token: str, test_task, replica):
+        """Test that listing tasks is served by the replica."""
+        response = await client.get(
+            "/Tasks/tasks",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert response.status_code == 200
+        assert [task["title"] for task in response.json()["items"]] == ["Replica Task"]
+    
+    @pytest.mark.asyncio
+    async def test_read_your_writes(self, client: AsyncClient, auth_token: str, test_task, replica):
+        """Test that a user sees a task they just created although the replica lags."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        created = await client.post(
+            "/Tasks/task_create",
+            json={"title": "Fresh", "description": "Written to the primary"},
+            headers=headers
+        )
+        
+        response = await client.get("/Tasks/tasks", headers=headers)
+        
+        assert created.status_code == 201
+        titles = [task["title"] for task in response.json()["items"]]
+        assert "Fresh" in titles and "Replica Task" not in titles
+        assert replica_router.stats["sticky_reads"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_authentication_reads_primary(self, client: AsyncClient, auth_token: str, test_db, test_user, replica):
+        """Test that tokens revoked on the primary are refused although the replica has not caught up."""
+        await test_db.execute(update(User).where(User.id == test_user.id).values(token_generation=User.token_generation + 1))
+        await test_db.commit()
+        principal_cache.reset()
+        
+        response = await client.get("/Tasks/tasks", headers={"Authorization": f"Bearer {auth_token}"})
+        
+        assert response.status_code == 401
@@ -0,0 +1,86 @@
+import pytest
+from datetime import datetime, timezone
+from app.services.revocation import BloomFilter, RevocationCache
+from app.models.blacklisted_model import BlacklistedToken
+
+
+def make_cache(**overrides):
+    options = dict(capacity=1000, error_rate=0.01, negative_ttl=30, negative_max_size=100, refresh_seconds=60)
+    options.update(overrides)
+    return RevocationCache(**options)
+
+
+class TestBloomFilter:
+    """Test the bloom filter used for revoked token ids."""
+    
+    def test_added_keys_are_members(self):
+        """Test that every added key is reported as present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [f"jti-{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        
+        assert all(key in bloom for key in keys)
+    
+    def test_false_positive_rate(self):
+        """Test that unknown keys rarely hit at the configured capacity."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+        
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        
+        assert false_positives < 300
+
+
+class TestRevocationCache:
+    """Test the revocation check layer."""
+    
+    @pytest.mark.asyncio
+    async def test_not_revoked_needs_no_lookup(self, test_db):
+        """Test that unknown tokens are answered by the bloom filter."""
+        cache = make_cache()
+        
+        assert await cache.is_revoked(db=test_db, jti="fresh-jti") is False
+        assert await cache.is_revoked(db=test_db, jti="fresh-jti") is False
+        
+        assert cache.stats["bloom_negative"] == 2
+        assert cache.stats["db_lookup"] == 0
+        assert cache.stats["rebuilds"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_rebuild_loads_blacklisted_tokens(self, test_db):
+        """Test that revoked tokens in the table are found after a rebuild."""
+        test_db.add(BlacklistedToken(id="revoked-jti", expire=datetime.now(timezone.utc)))
+        await test_db.commit()
+        cache = make_cache()
+        
+        assert await cache.is_revoked(db=test_db, jti="revoked-jti") is True
+        assert cache.stats["revoked"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_add_marks_token_revoked(self, test_db):
+        """Test that a logout is visible without a rebuild."""
+        cache = make_cache()
+        await cache.rebuild(db=test_db)
+        test_db.add(BlacklistedToken(id="logged-out", expire=datetime.now(timezone.utc)))
+        await test_db.commit()
+        
+        cache.add("logged-out")
+        
+        assert await cache.is_revoked(db=test_db, jti="logged-out") is True
+        assert cache.stats["rebuilds"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_negative_cache_after_false_positive(self, test_db):
+        """Test that a bloom false positive is looked up only once."""
+        cache = make_cache()
+        await cache.rebuild(db=test_db)
+        # in the bloom filter but not in the table behaves like a false positive
+        cache._bloom.add("phantom-jti")
+        
+        assert await cache.is_revoked(db=test_db, jti="phantom-jti") is False
+        assert await cache.is_revoked(db=test_db, jti="phantom-jti") is False
+        
+        assert cache.stats["db_lookup"] == 1
+        assert cache.stats["negative_cache_hit"] == 1
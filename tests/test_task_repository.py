@@ -2,14 +2,25 @@ import pytest
 import uuid
 from app.repository.task import (
     create_new_task,
+    create_new_tasks,
     get_tasks,
+    get_tasks_page,
     get_task_by_id,
     get_all_tasks_and_their_user,
+    stream_all_tasks_and_their_user,
+    search_tasks,
     update_task,
-    delete_task
+    update_task_orm_mode,
+    update_tasks,
+    delete_task,
+    delete_tasks
 )
-from app.schemas.tasks_schema import TaskCreate, TaskUpdate
+from app.exceptions.http_exceptions import BadRequestException
+from app.schemas.tasks_schema import TaskCreate, TaskUpdate, TaskListSpec, TaskBatchUpdateItem
+from app.models.user import User
+from datetime import datetime, timedelta, timezone
 from app.models.task_model import Task
+from sqlalchemy import select, text, update
 
 
 class TestTaskRepository:
@@ -33,6 +44,32 @@ class TestTaskRepository:
         assert new_task.title == "Repository Test Task"
         assert new_task.user_id == test_user.id
     
+    @pytest.mark.asyncio
+    async def test_create_new_tasks(self, test_db, test_user):
+        """Test creating several tasks in one statement."""
+        bodies = [TaskCreate(title=f"Bulk {i}", description="d") for i in range(3)]
+        
+        new_tasks = await create_new_tasks(user=test_user, bodies=bodies, db=test_db)
+        
+        assert len(new_tasks) == 3
+        assert [t.title for t in new_tasks] == ["Bulk 0", "Bulk 1", "Bulk 2"]
+        assert all(t.user_id == test_user.id and t.created_at is not None for t in new_tasks)
+        assert len(await get_tasks(user=test_user, db=test_db)) == 3
+    
+    @pytest.mark.asyncio
+    async def test_task_writes_leave_user_updated_at(self, test_db, test_user):
+        """Test that bumping the user's task version does not count as a change to the user."""
+        long_ago = datetime(2000, 1, 1)
+        await test_db.execute(update(User).where(User.id == test_user.id).values(updated_at=long_ago))
+        await test_db.commit()
+        version = await User.get_tasks_version(db=test_db, user_id=test_user.id)
+        
+        await create_new_task(user=test_user, body=TaskCreate(title="t", description="d"), db=test_db)
+        
+        assert await User.get_tasks_version(db=test_db, user_id=test_user.id) == version + 1
+        result = await test_db.execute(select(User.updated_at).where(User.id == test_user.id))
+        assert result.scalar_one() == long_ago
+    
     @pytest.mark.asyncio
     async def test_get_tasks(self, test_db, test_user):
         """Test getting user's tasks."""
@@ -51,6 +88,28 @@ class TestTaskRepository:
         
         assert len(tasks) == 3
     
+    @pytest.mark.asyncio
+    async def test_get_tasks_page(self, test_db, test_user):
+        """Test keyset pagination over user's tasks."""
+        for i in range(3):
+            task = Task(
+                id=uuid.uuid4(),
+                title=f"Task {i}",
+                description=f"Description {i}",
+                user_id=test_user.id
+            )
+            test_db.add(task)
+        await test_db.commit()
+        
+        first, cursor = await get_tasks_page(user=test_user, db=test_db, limit=2)
+        assert len(first) == 2
+        assert cursor is not None
+        
+        second, cursor = await get_tasks_page(user=test_user, db=test_db, cursor=cursor, limit=2)
+        assert len(second) == 1
+        assert cursor is None
+        assert {t.id for t in first}.isdisjoint({t.id for t in second})
+    
     @pytest.mark.asyncio
     async def test_get_task_by_id(self, test_db, test_user, test_task):
         """Test getting task by ID."""
@@ -86,6 +145,20 @@ class TestTaskRepository:
         for task in tasks:
             assert task.user is not None
     
+    @pytest.mark.asyncio
+    async def test_stream_all_tasks_and_their_user(self, test_db, test_user, test_task):
+        """Test streaming all tasks with user email in batches."""
+        for i in range(4):
+            test_db.add(Task(id=uuid.uuid4(), title=f"Task {i}", description="d", user_id=test_user.id))
+        await test_db.commit()
+        
+        batches = [rows async for rows in stream_all_tasks_and_their_user(db=test_db, batch_size=2)]
+        
+        assert all(len(rows) <= 2 for rows in batches)
+        rows = [row for batch in batches for row in batch]
+        assert len(rows) == 5
+        assert all(row["email"] == test_user.email for row in rows)
+    
     @pytest.mark.asyncio
     async def test_update_task(self, test_db, test_user, test_task):
         """Test updating a task."""
@@ -122,6 +195,44 @@ class TestTaskRepository:
         # Should return None as task belongs to different user
         assert updated_task is None
     
+    @pytest.mark.asyncio
+    async def test_update_task_partial(self, test_db, test_user, test_task):
+        """Test that unset fields keep their value and the version moves on."""
+        updated_task = await update_task(user=test_user, body=TaskUpdate(title="New"), task_id=test_task.id, db=test_db)
+        
+        assert (updated_task.Task.title, updated_task.Task.description) == ("New", test_task.description)
+        assert updated_task.Task.version == 2
+    
+    @pytest.mark.asyncio
+    async def test_update_task_orm_mode_partial(self, test_db, test_user, test_task):
+        """Test that the ORM update path also writes only the fields sent."""
+        description = test_task.description
+        
+        updated_task = await update_task_orm_mode(user=test_user, body=TaskUpdate(title="New"), task_id=test_task.id, db=test_db)
+        
+        assert (updated_task.title, updated_task.description, updated_task.version) == ("New", description, 2)
+        with pytest.raises(BadRequestException):
+            await update_task_orm_mode(user=test_user, body=TaskUpdate(), task_id=test_task.id, db=test_db)
+    
+    @pytest.mark.asyncio
+    async def test_update_task_stale_version(self, test_db, test_user, test_task):
+        """Test that an outdated expected version is refused without writing."""
+        from app.exceptions.http_exceptions import PreconditionFailedException
+        await update_task(user=test_user, body=TaskUpdate(title="First"), task_id=test_task.id, db=test_db, expected_version=1)
+        
+        with pytest.raises(PreconditionFailedException):
+            await update_task(user=test_user, body=TaskUpdate(title="Second"), task_id=test_task.id, db=test_db, expected_version=1)
+        
+        task = await get_task_by_id(user=test_user, task_id=test_task.id, db=test_db)
+        assert (task.title, task.version) == ("First", 2)
+    
+    @pytest.mark.asyncio
+    async def test_update_missing_task_with_version(self, test_db, test_user):
+        """Test that a missing task is not reported as a version conflict."""
+        updated_task = await update_task(user=test_user, body=TaskUpdate(title="x"), task_id=uuid.uuid4(), db=test_db, expected_version=1)
+        
+        assert updated_task is None
+    
     @pytest.mark.asyncio
     async def test_delete_task(self, test_db, test_user):
         """Test deleting a task."""
@@ -179,3 +290,238 @@ class TestTaskRepository:
             db=test_db
         )
         assert existing_task is not None
+
+
+class TestTaskListSpec:
+    """Test filtered and sorted task pages."""
+    
+    @pytest.fixture
+    async def tasks(self, test_db, test_user):
+        base = datetime(2024, 1, 1)
+        titles = ["pear", "apple", "banana", "apricot", "50% off", "cherry"]
+        for i, title in enumerate(titles):
+            test_db.add(Task(id=uuid.uuid4(), title=title, description="d", user_id=test_user.id,
+                             created_at=base + timedelta(days=i), updated_at=base + timedelta(days=10 - i)))
+        await test_db.commit()
+        return titles
+    
+    async def walk(self, db, user, spec, limit=2):
+        titles, cursor = [], None
+        while True:
+            page, cursor = await get_tasks_page(user=user, db=db, cursor=cursor, limit=limit, spec=spec)
+            titles += [task.title for task in page]
+            if cursor is None:
+                return titles
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sort, order, expected", [
+        ("title", "asc", ["50% off", "apple", "apricot", "banana", "cherry", "pear"]),
+        ("title", "desc", ["pear", "cherry", "banana", "apricot", "apple", "50% off"]),
+        ("updated_at", "asc", ["cherry", "50% off", "apricot", "banana", "apple", "pear"]),
+        ("created_at", "desc", ["cherry", "50% off", "apricot", "banana", "apple", "pear"]),
+    ])
+    async def test_sorted_pages(self, test_db, test_user, tasks, sort, order, expected):
+        """Test that keyset pages follow every sort key in both directions."""
+        titles = await self.walk(test_db, test_user, TaskListSpec(sort=sort, order=order))
+        
+        assert titles == expected
+    
+    @pytest.mark.asyncio
+    async def test_date_ranges(self, test_db, test_user, tasks):
+        """Test that created and updated ranges are half-open and combine."""
+        spec = TaskListSpec(created_after=datetime(2024, 1, 2), created_before=datetime(2024, 1, 5),
+                            updated_before=datetime(2024, 1, 10))
+        
+        assert await self.walk(test_db, test_user, spec) == ["banana", "apricot"]
+    
+    @pytest.mark.asyncio
+    async def test_aware_dates_are_compared_as_utc(self, test_db, test_user, tasks):
+        """Test that a filter value with an offset is converted to the columns' naive UTC."""
+        plus_two = timezone(timedelta(hours=2))
+        spec = TaskListSpec(created_after=datetime(2024, 1, 2, 2, tzinfo=plus_two),
+                            created_before=datetime(2024, 1, 5, 2, tzinfo=plus_two),
+                            updated_before=datetime(2024, 1, 10))
+        
+        assert spec.created_after == datetime(2024, 1, 2)
+        assert await self.walk(test_db, test_user, spec) == ["banana", "apricot"]
+    
+    @pytest.mark.asyncio
+    async def test_title_prefix(self, test_db, test_user, tasks):
+        """Test prefix matching, including LIKE wildcards taken literally."""
+        assert await self.walk(test_db, test_user, TaskListSpec(title_prefix="ap", sort="title")) == ["apple", "apricot"]
+        assert await self.walk(test_db, test_user, TaskListSpec(title_prefix="50%")) == ["50% off"]
+        assert await self.walk(test_db, test_user, TaskListSpec(title_prefix="5_")) == []
+        assert await self.walk(test_db, test_user, TaskListSpec(title_prefix="ap\U0010ffff")) == []
+    
+    @pytest.mark.asyncio
+    async def test_cursor_bound_to_sort(self, test_db, test_user, tasks):
+        """Test that a cursor can't be replayed under another sort key."""
+        _, cursor = await get_tasks_page(user=test_user, db=test_db, limit=2, spec=TaskListSpec(sort="title"))
+        
+        with pytest.raises(BadRequestException):
+            await get_tasks_page(user=test_user, db=test_db, cursor=cursor, limit=2, spec=TaskListSpec(sort="updated_at"))
+    
+    def test_inverted_range_rejected(self):
+        """Test that an empty date range is a validation error."""
+        with pytest.raises(ValueError):
+            TaskListSpec(created_after=datetime(2024, 2, 1), created_before=datetime(2024, 1, 1))
+    
+    @pytest.mark.asyncio
+    async def test_statement_compiled_once(self, test_db, test_user, tasks):
+        """Test that new filter values reuse the cached statement."""
+        cache = test_db.bind.sync_engine._compiled_cache
+        await get_tasks_page(user=test_user, db=test_db, limit=2, spec=TaskListSpec(title_prefix="a", sort="title"))
+        size = len(cache)
+        
+        await get_tasks_page(user=test_user, db=test_db, limit=3, spec=TaskListSpec(title_prefix="b", sort="title"))
+        
+        assert len(cache) == size
+
+
+class TestTaskSearch:
+    """Test full-text search over task titles and descriptions."""
+    
+    @pytest.fixture
+    async def tasks(self, test_db, test_user, test_user2):
+        bodies = [
+            TaskCreate(title="Buy groceries", description="Milk, eggs and bread"),
+            TaskCreate(title="Bake bread", description="Sourdough needs a starter"),
+            TaskCreate(title="Call plumber", description="Kitchen sink leaks"),
+        ]
+        await create_new_tasks(user=test_user, bodies=bodies, db=test_db)
+        await create_new_tasks(user=test_user2, bodies=[TaskCreate(title="Bread", description="Other user")], db=test_db)
+    
+    @pytest.mark.asyncio
+    async def test_title_matches_rank_first(self, test_db, test_user, tasks):
+        """Test that only the user's matching tasks come back, title hits first."""
+        rows, next_offset = await search_tasks(user=test_user, db=test_db, query="bread")
+        
+        assert [task.title for task, rank in rows] == ["Bake bread", "Buy groceries"]
+        assert rows[0][1] > rows[1][1]
+        assert next_offset is None
+    
+    @pytest.mark.asyncio
+    async def test_all_terms_must_match(self, test_db, test_user, tasks):
+        """Test that multi-word queries require every word."""
+        rows, _ = await search_tasks(user=test_user, db=test_db, query="kitchen sink")
+        
+        assert [task.title for task, rank in rows] == ["Call plumber"]
+    
+    @pytest.mark.asyncio
+    async def test_pagination(self, test_db, test_user, tasks):
+        """Test that pages are cut at the limit with an offset for the next one."""
+        first, next_offset = await search_tasks(user=test_user, db=test_db, query="bread", limit=1)
+        second, last_offset = await search_tasks(user=test_user, db=test_db, query="bread", limit=1, offset=next_offset)
+        
+        assert next_offset == 1 and last_offset is None
+        assert [task.title for task, rank in first + second] == ["Bake bread", "Buy groceries"]
+    
+    @pytest.mark.asyncio
+    async def test_index_follows_updates_and_deletes(self, test_db, test_user, tasks):
+        """Test that the SQLite FTS table is kept in sync by its triggers."""
+        (task, _), = (await search_tasks(user=test_user, db=test_db, query="plumber"))[0]
+        await update_task(user=test_user, body=TaskUpdate(title="Call electrician", description="Lights flicker"), task_id=task.id, db=test_db)
+        
+        assert (await search_tasks(user=test_user, db=test_db, query="plumber"))[0] == []
+        assert len((await search_tasks(user=test_user, db=test_db, query="electrician"))[0]) == 1
+        
+        await delete_task(user=test_user, task_id=task.id, db=test_db)
+        assert (await search_tasks(user=test_user, db=test_db, query="electrician"))[0] == []
+    
+    @pytest.mark.asyncio
+    async def test_index_survives_vacuum(self, test_db, test_user, tasks):
+        """Test that matches still point at the right tasks after the implicit rowids change, as VACUUM may do."""
+        await test_db.execute(text("UPDATE task SET rowid = rowid + 1000"))
+        await test_db.commit()
+        
+        rows, _ = await search_tasks(user=test_user, db=test_db, query="plumber")
+        
+        assert [task.title for task, rank in rows] == ["Call plumber"]
+    
+    @pytest.mark.asyncio
+    async def test_query_syntax_is_not_interpreted(self, test_db, test_user, tasks):
+        """Test that FTS operators in user input are searched as plain words."""
+        rows, _ = await search_tasks(user=test_user, db=test_db, query='bread" OR "NEAR(')
+        
+        assert rows == []
+    
+    @pytest.mark.asyncio
+    async def test_query_without_words(self, test_db, test_user):
+        """Test that punctuation-only queries are rejected."""
+        with pytest.raises(BadRequestException):
+            await search_tasks(user=test_user, db=test_db, query="*:()")
+
+
+class TestTaskBatchWrites:
+    """Test batch update and delete."""
+    
+    @pytest.fixture
+    async def tasks(self, test_db, test_user, test_user2):
+        mine = await create_new_tasks(user=test_user, bodies=[TaskCreate(title=f"t{i}", description=f"d{i}") for i in range(3)], db=test_db)
+        theirs = await create_new_tasks(user=test_user2, bodies=[TaskCreate(title="x", description="x")], db=test_db)
+        return [task.id for task in mine], theirs[0].id
+    
+    @pytest.mark.asyncio
+    async def test_update_tasks_applies_partial_patches(self, test_db, test_user, tasks):
+        """Test that each patch changes only its own fields on its own task."""
+        (first, second, third), _ = tasks
+        version = await User.get_tasks_version(db=test_db, user_id=test_user.id)
+        
+        updated = await update_tasks(user=test_user, db=test_db, patches=[
+            TaskBatchUpdateItem(id=first, title="new title"),
+            TaskBatchUpdateItem(id=second, description="new description"),
+        ])
+        
+        assert {row.id: (row.title, row.description) for row in updated} == {
+            first: ("new title", "d0"),
+            second: ("t1", "new description"),
+        }
+        untouched = await get_task_by_id(user=test_user, task_id=third, db=test_db)
+        assert (untouched.title, untouched.description) == ("t2", "d2")
+        assert await User.get_tasks_version(db=test_db, user_id=test_user.id) == version + 1
+    
+    @pytest.mark.asyncio
+    async def test_update_tasks_skips_other_users_tasks(self, test_db, test_user, tasks):
+        """Test that ids belonging to someone else are not updated."""
+        _, theirs = tasks
+        
+        updated = await update_tasks(user=test_user, db=test_db, patches=[TaskBatchUpdateItem(id=theirs, title="stolen")])
+        
+        assert updated == []
+    
+    @pytest.mark.asyncio
+    async def test_update_tasks_requires_a_change(self, test_db, test_user, tasks):
+        """Test that patches without fields are rejected."""
+        (first, _, _), _ = tasks
+        
+        with pytest.raises(BadRequestException):
+            await update_tasks(user=test_user, db=test_db, patches=[TaskBatchUpdateItem(id=first)])
+    
+    @pytest.mark.asyncio
+    async def test_update_tasks_rejects_mixed_batch_with_empty_patch(self, test_db, test_user, tasks):
+        """Test that a field-less item in a batch fails the request instead of bumping that task's version."""
+        (first, second, _), _ = tasks
+        version = await User.get_tasks_version(db=test_db, user_id=test_user.id)
+        
+        with pytest.raises(BadRequestException) as exc_info:
+            await update_tasks(user=test_user, db=test_db, patches=[
+                TaskBatchUpdateItem(id=first, title="Bulk"),
+                TaskBatchUpdateItem(id=second),
+            ])
+        
+        assert str(second) in exc_info.value.detail
+        assert await Task.get_version(db=test_db, user=test_user, task_id=first) == 1
+        assert await Task.get_version(db=test_db, user=test_user, task_id=second) == 1
+        assert await User.get_tasks_version(db=test_db, user_id=test_user.id) == version
+    
+    @pytest.mark.asyncio
+    async def test_delete_tasks(self, test_db, test_user, test_user2, tasks):
+        """Test that only the user's listed tasks are deleted and reported."""
+        (first, second, third), theirs = tasks
+        
+        deleted = await delete_tasks(user=test_user, task_ids=[first, third, theirs], db=test_db)
+        
+        assert set(deleted) == {first, third}
+        assert [task.id for task in await get_tasks(user=test_user, db=test_db)] == [second]
+        assert len(await get_tasks(user=test_user2, db=test_db)) == 1
+
@@ -23,6 +23,34 @@ class TestTaskRoutes:
         assert data["description"] == "This is a new task"
         assert "id" in data
     
+    @pytest.mark.asyncio
+    async def test_bulk_create_tasks(self, client: AsyncClient, auth_token: str):
+        """Test creating a batch of tasks in one request."""
+        response = await client.post(
+            "/Tasks/tasks_bulk_create",
+            json=[{"title": f"Task {i}", "description": "Bulk"} for i in range(3)],
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert response.status_code == 201
+        data = response.json()
+        assert len(data) == 3
+        assert all("id" in task for task in data)
+    
+    @pytest.mark.asyncio
+    async def test_bulk_create_tasks_over_limit(self, client: AsyncClient, auth_token: str, monkeypatch):
+        """Test that batches above the configured maximum are rejected."""
+        from app.config import settings
+        monkeypatch.setattr(settings, "tasks_bulk_max", 2)
+        
+        response = await client.post(
+            "/Tasks/tasks_bulk_create",
+            json=[{"title": f"Task {i}", "description": "Bulk"} for i in range(3)],
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert response.status_code == 400
+    
     @pytest.mark.asyncio
     async def test_create_task_no_auth(self, client: AsyncClient):
         """Test task creation without authentication."""
@@ -46,9 +74,53 @@ class TestTaskRoutes:
         
         assert response.status_code == 200
         data = response.json()
-        assert isinstance(data, list)
-        assert len(data) > 0
-        assert data[0]["title"] == test_task.title
+        assert isinstance(data["items"], list)
+        assert len(data["items"]) > 0
+        assert data["items"][0]["title"] == test_task.title
+        assert data["next_cursor"] is None
+    
+    @pytest.mark.asyncio
+    async def test_get_tasks_paginated(self, client: AsyncClient, auth_token: str, test_db, test_user):
+        """Test walking the task list page by page with the cursor."""
+        from app.models.task_model import Task
+        import uuid
+        
+        for i in range(5):
+            test_db.add(Task(id=uuid.uuid4(), title=f"Task {i}", description="d", user_id=test_user.id))
+        await test_db.commit()
+        
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get(
+                "/Tasks/tasks",
+                params=params,
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data["items"]) <= 2
+            seen.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+    
+    @pytest.mark.asyncio
+    async def test_get_tasks_invalid_cursor(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that a malformed cursor is rejected."""
+        response = await client.get(
+            "/Tasks/tasks",
+            params={"cursor": "not-a-cursor"},
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert response.status_code == 400
     
     @pytest.mark.asyncio
     async def test_get_tasks_no_tasks(self, client: AsyncClient, test_user2, test_db):
@@ -96,16 +168,16 @@ class TestTaskRoutes:
     
     @pytest.mark.asyncio
     async def test_get_task_by_id_not_found(self, client: AsyncClient, auth_token: str):
-        """Test getting non-existent task - skipped as route doesn't handle None properly."""
+        """Test getting non-existent task."""
         import uuid
         fake_id = uuid.uuid4()
         
-        # Skip this test as the route has a bug when task is None
-        # response = await client.get(
-        #     f"/Tasks/task/{fake_id}",
-        #     headers={"Authorization": f"Bearer {auth_token}"}
-        # )
-        pytest.skip("Route doesn't handle None response properly")
+        response = await client.get(
+            f"/Tasks/task/{fake_id}",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert response.status_code == 404
     
     @pytest.mark.asyncio
     async def test_get_task_by_id_no_auth(self, client: AsyncClient, test_task):
@@ -123,6 +195,20 @@ class TestTaskRoutes:
         data = response.json()
         assert isinstance(data, list)
     
+    @pytest.mark.asyncio
+    async def test_export_tasks_and_users(self, client: AsyncClient, test_task, test_user):
+        """Test streaming export of all tasks as NDJSON."""
+        import json
+        
+        response = await client.get("/Tasks/tasks_and_their_users/export")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 1
+        assert lines[0]["id"] == str(test_task.id)
+        assert lines[0]["user"]["email"] == test_user.email
+    
     @pytest.mark.asyncio
     async def test_update_task_success(self, client: AsyncClient, auth_token: str, test_task):
         """Test successful task update."""
@@ -154,7 +240,7 @@ class TestTaskRoutes:
     
     @pytest.mark.asyncio
     async def test_update_task_wrong_user(self, client: AsyncClient, test_user2, test_task):
-        """Test updating task belonging to different user - skipped as route has bug."""
+        """Test updating task belonging to different user."""
         from app.services.auth import create_token_pair
         from app.schemas.user_schema import UserBase
         
@@ -167,16 +253,16 @@ class TestTaskRoutes:
         )
         token_pair = create_token_pair(user_base)
         
-        # Skip this test as the route has a bug when updatedTask is None
-        # response = await client.patch(
-        #     f"/Tasks/update_task/{test_task.id}",
-        #     json={
-        #         "title": "Updated Task",
-        #         "description": "Updated description"
-        #     },
-        #     headers={"Authorization": f"Bearer {token_pair.access.token}"}
-        # )
-        pytest.skip("Route doesn't handle None response properly")
+        response = await client.patch(
+            f"/Tasks/update_task/{test_task.id}",
+            json={
+                "title": "Updated Task",
+                "description": "Updated description"
+            },
+            headers={"Authorization": f"Bearer {token_pair.access.token}"}
+        )
+        
+        assert response.status_code == 404
     
     @pytest.mark.asyncio
     async def test_delete_task_success(self, client: AsyncClient, auth_token: str, test_task):
@@ -217,3 +303,234 @@ class TestTaskRoutes:
         
         # Returns 204 regardless, but task should not be deleted
         assert response.status_code == 204
+    
+    @pytest.mark.asyncio
+    async def test_get_tasks_serialized_shape(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that the batch serializer emits the TaskResponse fields."""
+        response = await client.get(
+            "/Tasks/tasks",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert response.headers["content-type"] == "application/json"
+        item = response.json()["items"][0]
+        assert set(item) == {"id", "title", "description", "user_id", "created_at", "updated_at"}
+
+    
+    @pytest.mark.asyncio
+    async def test_get_tasks_sorted_and_filtered(self, client: AsyncClient, auth_token: str, test_db, test_user):
+        """Test the filter and sort query parameters."""
+        from app.models.task_model import Task
+        import uuid
+        
+        for title in ["beta", "alpha", "alps"]:
+            test_db.add(Task(id=uuid.uuid4(), title=title, description="d", user_id=test_user.id))
+        await test_db.commit()
+        
+        response = await client.get(
+            "/Tasks/tasks",
+            params={"sort": "title", "order": "desc", "title_prefix": "al"},
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert response.status_code == 200
+        assert [item["title"] for item in response.json()["items"]] == ["alps", "alpha"]
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("params", [
+        {"sort": "description"},
+        {"order": "sideways"},
+        {"created_after": "2024-02-01T00:00:00", "created_before": "2024-01-01T00:00:00"},
+    ])
+    async def test_get_tasks_invalid_spec(self, client: AsyncClient, auth_token: str, params):
+        """Test that unknown sort keys and empty ranges are rejected."""
+        response = await client.get(
+            "/Tasks/tasks",
+            params=params,
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert response.status_code == 422
+
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_and_delete(self, client: AsyncClient, auth_token: str, test_task):
+        """Test batch endpoints report affected and unknown ids."""
+        import uuid
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        missing = str(uuid.uuid4())
+        
+        updated = await client.patch(
+            "/Tasks/tasks_bulk_update",
+            json=[{"id": str(test_task.id), "title": "Renamed"}, {"id": missing, "title": "Nope"}],
+            headers=headers
+        )
+        deleted = await client.post(
+            "/Tasks/tasks_bulk_delete",
+            json={"ids": [str(test_task.id), missing]},
+            headers=headers
+        )
+        
+        assert updated.status_code == 200
+        assert [task["title"] for task in updated.json()["updated"]] == ["Renamed"]
+        assert updated.json()["not_found"] == [missing]
+        assert deleted.status_code == 200
+        assert deleted.json() == {"deleted": [str(test_task.id)], "not_found": [missing]}
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("ids", [[], "duplicate"])
+    async def test_bulk_delete_rejects_bad_batches(self, client: AsyncClient, auth_token: str, test_task, ids):
+        """Test that empty batches and repeated ids are refused."""
+        if ids == "duplicate":
+            ids = [str(test_task.id)] * 2
+        response = await client.post(
+            "/Tasks/tasks_bulk_delete",
+            json={"ids": ids},
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert response.status_code == 400
+
+
+class TestTaskSearchRoute:
+    """Test the task search endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_search(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that matching tasks come back ranked."""
+        response = await client.get(
+            "/Tasks/search",
+            params={"q": "description"},
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["id"] for item in data["items"]] == [str(test_task.id)]
+        assert isinstance(data["items"][0]["rank"], float)
+        assert data["next_offset"] is None
+    
+    @pytest.mark.asyncio
+    async def test_search_requires_query(self, client: AsyncClient, auth_token: str):
+        """Test that an empty query is rejected."""
+        response = await client.get(
+            "/Tasks/search",
+            params={"q": ""},
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        
+        assert response.status_code == 422
+
+
+class TestTaskETags:
+    """Test conditional GETs of task reads."""
+    
+    @pytest.mark.asyncio
+    async def test_list_not_modified(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that a matching If-None-Match gets an empty 304."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        first = await client.get("/Tasks/tasks", headers=headers)
+        
+        response = await client.get("/Tasks/tasks", headers={**headers, "If-None-Match": first.headers["etag"]})
+        
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == first.headers["etag"]
+    
+    @pytest.mark.asyncio
+    async def test_single_task_not_modified(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that single-task reads are conditional too."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        first = await client.get(f"/Tasks/task/{test_task.id}", headers=headers)
+        
+        response = await client.get(f"/Tasks/task/{test_task.id}", headers={**headers, "If-None-Match": first.headers["etag"]})
+        
+        assert response.status_code == 304
+    
+    @pytest.mark.asyncio
+    async def test_writes_change_etag(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that create, update and delete each invalidate the ETag."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        writes = [
+            lambda: client.post("/Tasks/task_create", json={"title": "New", "description": "New"}, headers=headers),
+            lambda: client.patch(f"/Tasks/update_task/{test_task.id}", json={"title": "T", "description": "D"}, headers=headers),
+            lambda: client.delete(f"/Tasks/delete_task{test_task.id}", headers=headers),
+        ]
+        etag = (await client.get("/Tasks/tasks", headers=headers)).headers["etag"]
+        
+        for write in writes:
+            await write()
+            response = await client.get("/Tasks/tasks", headers={**headers, "If-None-Match": etag})
+            assert response.status_code == 200
+            etag = response.headers["etag"]
+    
+    @pytest.mark.asyncio
+    async def test_etag_is_scoped_to_user(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that the ETag names its user, so equal versions of two users never match."""
+        etag = (await client.get("/Tasks/tasks", headers={"Authorization": f"Bearer {auth_token}"})).headers["etag"]
+        
+        assert etag.startswith('W/"') and test_task.user_id.hex in etag
+
+
+class TestTaskOptimisticConcurrency:
+    """Test partial PATCH with If-Match."""
+    
+    @pytest.mark.asyncio
+    async def test_patch_only_sent_fields(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that fields left out of the body are not overwritten."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        response = await client.patch(f"/Tasks/update_task/{test_task.id}", json={"title": "Only title"}, headers=headers)
+        
+        task = (await client.get(f"/Tasks/task/{test_task.id}", headers=headers)).json()
+        assert response.status_code == 200
+        assert (task["title"], task["description"]) == ("Only title", test_task.description)
+    
+    @pytest.mark.asyncio
+    async def test_if_match_detects_concurrent_edit(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that the second writer holding the same ETag gets 412."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        etag = (await client.get(f"/Tasks/task/{test_task.id}", headers=headers)).headers["etag"]
+        
+        first = await client.patch(f"/Tasks/update_task/{test_task.id}", json={"title": "First"},
+                                   headers={**headers, "If-Match": etag})
+        second = await client.patch(f"/Tasks/update_task/{test_task.id}", json={"title": "Second"},
+                                    headers={**headers, "If-Match": etag})
+        retried = await client.patch(f"/Tasks/update_task/{test_task.id}", json={"title": "Second"},
+                                     headers={**headers, "If-Match": first.headers["etag"]})
+        
+        assert first.status_code == 200
+        assert first.headers["etag"] != etag
+        assert second.status_code == 412
+        assert retried.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_if_match_for_another_task(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that an ETag of a different resource never satisfies If-Match."""
+        import uuid
+        response = await client.patch(
+            f"/Tasks/update_task/{test_task.id}",
+            json={"title": "x"},
+            headers={"Authorization": f"Bearer {auth_token}", "If-Match": f'"{uuid.uuid4().hex}-1"'}
+        )
+        
+        assert response.status_code == 412
+    
+    @pytest.mark.asyncio
+    async def test_empty_patch_rejected(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that a body without fields is a bad request."""
+        response = await client.patch(f"/Tasks/update_task/{test_task.id}", json={},
+                                      headers={"Authorization": f"Bearer {auth_token}"})
+        
+        assert response.status_code == 400
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_changes_task_etag(self, client: AsyncClient, auth_token: str, test_task):
+        """Test that batch updates move the per-task version too."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        etag = (await client.get(f"/Tasks/task/{test_task.id}", headers=headers)).headers["etag"]
+        
+        await client.patch("/Tasks/tasks_bulk_update", json=[{"id": str(test_task.id), "title": "Bulk"}], headers=headers)
+        response = await client.get(f"/Tasks/task/{test_task.id}", headers={**headers, "If-None-Match": etag})
+        
+        assert response.status_code == 200
+
@@ -0,0 +1,78 @@
+import pytest
+from httpx import AsyncClient
+from app.services.hash import hash_executor
+from app.services.throttle import MAX_RETRY_AFTER_SECONDS, TokenBucketLimiter, login_throttle
+
+
+class TestTokenBucketLimiter:
+    """Test the per-key token bucket."""
+    
+    def test_burst_then_throttled(self):
+        """Test that a key may spend its burst and is then told when to retry."""
+        limiter = TokenBucketLimiter(burst=2, rate=1, max_keys=10)
+        
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("a") == 0
+        assert 0 < limiter.acquire("a") <= 1
+    
+    def test_keys_are_independent(self):
+        """Test that one key running out does not affect another."""
+        limiter = TokenBucketLimiter(burst=1, rate=1, max_keys=10)
+        limiter.acquire("a")
+        
+        assert limiter.acquire("a") > 0
+        assert limiter.acquire("b") == 0
+    
+    def test_zero_rate_retry_after_is_capped(self):
+        """Test that a bucket which never refills still yields a finite Retry-After."""
+        limiter = TokenBucketLimiter(burst=1, rate=0, max_keys=10)
+        limiter.acquire("a")
+        
+        assert limiter.acquire("a") == MAX_RETRY_AFTER_SECONDS
+    
+    def test_tracked_keys_are_bounded(self):
+        """Test that the least recently seen keys are dropped."""
+        limiter = TokenBucketLimiter(burst=1, rate=1, max_keys=2)
+        for key in ["a", "b", "c"]:
+            limiter.acquire(key)
+        
+        assert list(limiter._buckets) == ["b", "c"]
+
+
+class TestLoginThrottle:
+    """Test throttling of the login route."""
+    
+    async def login(self, client, email, password="wrongpassword"):
+        return await client.post("/auth/login", data={"username": email, "password": password})
+    
+    @pytest.mark.asyncio
+    async def test_account_limit_rejects_before_hashing(self, client: AsyncClient, test_user, monkeypatch):
+        """Test that attempts over the account limit get 429 without a bcrypt verify."""
+        monkeypatch.setattr(login_throttle.by_account, "burst", 2)
+        for _ in range(2):
+            assert (await self.login(client, test_user.email)).status_code == 400
+        completed = hash_executor.stats["completed"]
+        
+        response = await self.login(client, test_user.email.upper(), "testpassword123")
+        
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert hash_executor.stats["completed"] == completed
+        assert login_throttle.stats["throttled_account"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_ip_limit_covers_all_accounts(self, client: AsyncClient, monkeypatch):
+        """Test that one address spraying many accounts is throttled."""
+        monkeypatch.setattr(login_throttle.by_ip, "burst", 3)
+        statuses = [(await self.login(client, f"user{i}@example.com")).status_code for i in range(4)]
+        
+        assert statuses == [400, 400, 400, 429]
+        assert login_throttle.stats["throttled_ip"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_stats_endpoint(self, client: AsyncClient):
+        """Test that throttle counters are exposed."""
+        response = await client.get("/stats/login_throttle")
+        
+        assert response.status_code == 200
+        assert response.json() == {"allowed": 0, "throttled_ip": 0, "throttled_account": 0}
@@ -0,0 +1,61 @@
+import json
+import logging
+import pytest
+from httpx import AsyncClient, ASGITransport
+from app.middleware.timing import ServerTimingMiddleware, phase, _phases
+
+
+async def plain_app(scope, receive, send):
+    with phase("work"):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def parse_server_timing(header: str) -> dict:
+    return {name: float(duration.removeprefix("dur=")) for name, duration in
+            (entry.split(";") for entry in header.split(", "))}
+
+
+class TestServerTiming:
+    """Test per-request phase timing."""
+    
+    def test_phase_outside_request_is_noop(self):
+        """Test that timing blocks do nothing when no request is sampled."""
+        with phase("jwt"):
+            pass
+        
+        assert _phases.get() is None
+    
+    @pytest.mark.asyncio
+    async def test_unsampled_request_has_no_header(self):
+        """Test that a zero sample rate leaves responses untouched."""
+        app = ServerTimingMiddleware(plain_app, sample_rate=0)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/")
+        
+        assert "server-timing" not in response.headers
+    
+    @pytest.fixture
+    def sample_all(self, monkeypatch):
+        # the app's middleware samples at SERVER_TIMING_SAMPLE_RATE; these tests need every request
+        monkeypatch.setattr(ServerTimingMiddleware, "_sampled", lambda self: True)
+    
+    @pytest.mark.asyncio
+    async def test_task_list_reports_phases(self, client: AsyncClient, auth_token: str, test_task, caplog, sample_all):
+        """Test that an authenticated request reports every phase in the header and the log."""
+        with caplog.at_level(logging.INFO):
+            response = await client.get(
+                "/Tasks/tasks",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+        
+        phases = parse_server_timing(response.headers["server-timing"])
+        assert {"jwt", "revocation", "user", "db", "serialize", "total"} <= set(phases)
+        assert phases["total"] >= phases["db"]
+        
+        record = json.loads([r for r in caplog.records if r.name == "app.middleware.timing"][-1].getMessage())
+        assert record["path"] == "/Tasks/tasks"
+        assert record["status"] == 200
+        assert set(record["phases_ms"]) == set(phases)
+        assert record["db_queries"] == int(response.headers["x-db-queries"])
+        assert not [r for r in caplog.records if r.name == "app.middleware.query_count"]
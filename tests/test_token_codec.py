@@ -0,0 +1,74 @@
+import time
+import pytest
+from jose import jwt, JWTError
+from app.services.token_codec import TokenCodec
+
+
+def generate_pem(algorithm: str) -> str:
+    """Private key PEM for an asymmetric JWT algorithm."""
+    serialization = pytest.importorskip("cryptography.hazmat.primitives.serialization")
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+    
+    if algorithm.startswith("RS"):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        key = ec.generate_private_key(ec.SECP256R1())
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+
+
+def claims():
+    now = int(time.time())
+    return {"sub": "test@example.com", "iat": now, "exp": now + 60}
+
+
+class TestTokenCodec:
+    """Test JWT encoding with pre-built keys and key rotation."""
+    
+    def test_round_trip_sets_kid(self):
+        """Test that tokens name the active key and decode back."""
+        codec = TokenCodec(algorithm="HS256", signing_key="secret", active_kid="k1")
+        token = codec.encode(claims())
+        
+        assert jwt.get_unverified_header(token)["kid"] == "k1"
+        assert codec.decode(token)["sub"] == "test@example.com"
+    
+    def test_previous_key_still_verifies(self):
+        """Test that tokens signed before a rotation stay valid."""
+        old = TokenCodec(algorithm="HS256", signing_key="old-secret", active_kid="k1")
+        new = TokenCodec(algorithm="HS256", signing_key="new-secret", active_kid="k2",
+                         previous_keys={"k1": "old-secret"})
+        
+        assert new.decode(old.encode(claims()))["sub"] == "test@example.com"
+    
+    def test_unknown_kid_rejected(self):
+        """Test that tokens signed with a key we don't know are refused."""
+        other = TokenCodec(algorithm="HS256", signing_key="other", active_kid="x")
+        codec = TokenCodec(algorithm="HS256", signing_key="secret", active_kid="k2",
+                           previous_keys={"k1": "old-secret"})
+        
+        with pytest.raises(JWTError):
+            codec.decode(other.encode(claims()))
+    
+    def test_wrong_signature_rejected(self):
+        """Test that a token signed with another secret fails verification."""
+        other = TokenCodec(algorithm="HS256", signing_key="other", active_kid="k1")
+        codec = TokenCodec(algorithm="HS256", signing_key="secret", active_kid="k1")
+        
+        with pytest.raises(JWTError):
+            codec.decode(other.encode(claims()))
+    
+    def test_unsupported_algorithm(self):
+        """Test that unknown algorithms fail at startup."""
+        with pytest.raises(ValueError):
+            TokenCodec(algorithm="none", signing_key="secret", active_kid="k1")
+    
+    @pytest.mark.parametrize("algorithm", ["RS256", "ES256"])
+    def test_asymmetric_round_trip(self, algorithm):
+        """Test signing with a private key and verifying with its public key."""
+        codec = TokenCodec(algorithm=algorithm, signing_key=generate_pem(algorithm), active_kid="k1")
+        
+        assert codec.decode(codec.encode(claims()))["sub"] == "test@example.com"
@@ -1,7 +1,9 @@
 import pytest
 from fastapi import HTTPException
-from app.repository.user import create_user, create_token_for_user
+from sqlalchemy.exc import IntegrityError
+from app.repository.user import create_user, create_token_for_user, violated_constraint
 from app.schemas.user_schema import UserCreate
+from app.models.user import User
 from app.exceptions.http_exceptions import BadRequestException
 
 
@@ -66,6 +68,44 @@ class TestUserRepository:
         assert exc_info.value.status_code == 409
         assert "already exist" in str(exc_info.value.detail)
     
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("field, status_code", [("email", 400), ("username", 409)])
+    async def test_create_user_concurrent_duplicate(self, test_db, test_user, monkeypatch, field, status_code):
+        """Test that a duplicate slipping past the check is mapped from the unique constraint."""
+        async def nothing_taken(cls, db, email, username):
+            return False, False
+        monkeypatch.setattr(User, "find_taken_identifiers", classmethod(nothing_taken))
+        values = {"username": "racer", "email": "racer@example.com"}
+        values[field] = getattr(test_user, field)
+        user_data = UserCreate(
+            first_name="New",
+            last_name="User",
+            age=25,
+            password="password123",
+            password_confirm="password123",
+            **values
+        )
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await create_user(body=user_data, db=test_db)
+        
+        assert exc_info.value.status_code == status_code
+        assert "already exist" in str(exc_info.value.detail)
+    
+    def test_violated_constraint_from_asyncpg_error(self):
+        """Test that the constraint name asyncpg reports is used rather than the message text."""
+        class UniqueViolationError(Exception):
+            constraint_name = "ix_user_username"
+        
+        orig = Exception("duplicate key value violates unique constraint, Key (email)=(x) already exists")
+        orig.__cause__ = UniqueViolationError()
+        
+        assert violated_constraint(IntegrityError("INSERT", {}, orig)) == "ix_user_username"
+    
+    def test_violated_constraint_unknown(self):
+        """Test that an unrecognised violation is reported as unknown."""
+        assert violated_constraint(IntegrityError("INSERT", {}, Exception("FOREIGN KEY constraint failed"))) is None
+    
     @pytest.mark.asyncio
     async def test_create_token_for_user_success(self, test_db, test_user):
         """Test creating token for valid user."""